@@ -11,22 +11,31 @@
 #    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
+import asyncio
+import functools
 import os
-import tarfile
 import tempfile
 import uuid
 import warnings
-from dataclasses import dataclass
+from contextlib import closing
+from dataclasses import InitVar, dataclass
 from typing import Optional
 
-from modelstore.models.managers import iter_libraries, matching_managers, get_manager
+from modelstore.models.managers import iter_libraries, matching_managers
+from modelstore.models.missing_manager import MissingDepManager
+from modelstore.models.model_manager import ModelManager
 from modelstore.models.multiple_models import MultipleModelsManager
 from modelstore.storage.aws import BOTO_EXISTS, AWSStorage
 from modelstore.storage.azure import AZURE_EXISTS, AzureBlobStorage
 from modelstore.storage.gcloud import GCLOUD_EXISTS, GoogleCloudStorage
 from modelstore.storage.local import FileSystemStorage
 from modelstore.storage.storage import CloudStorage
-from modelstore.utils.exceptions import ModelExistsException, ModelNotFoundException, FilePullFailedException
+from modelstore.utils.archives import extract_archive
+from modelstore.utils.exceptions import ModelExistsException
+
+# Cloud storage that has been validated by this process is not validated
+# again when another ModelStore is created for it, to avoid a network request
+_VALIDATED_STORAGE = set()
 
 
 @dataclass(frozen=True)
@@ -35,38 +44,60 @@ class ModelStore:
     # The backend provider, e.g. "gcloud"
     storage: CloudStorage
 
+    # Whether to validate the storage (e.g., check that the bucket exists)
+    validate: InitVar[bool] = True
+
     @classmethod
     def from_aws_s3(
         cls,
         bucket_name: Optional[str] = None,
         region: Optional[str] = None,
         root_prefix: Optional[str] = None,
+        max_pool: Optional[int] = None,
+        validate: bool = True,
     ) -> "ModelStore":
         """Creates a ModelStore instance that stores models to an AWS s3
         bucket.
 
-        This currently assumes that the s3 bucket already exists."""
+        This currently assumes that the s3 bucket already exists.
+
+        The client keeps up to max_pool connections open. If validate is
+        False, the bucket is not checked when the ModelStore is created."""
         if not BOTO_EXISTS:
             raise ModuleNotFoundError("boto3 is not installed!")
         return ModelStore(
             storage=AWSStorage(
-                bucket_name=bucket_name, region=region, root_prefix=root_prefix
-            )
+                bucket_name=bucket_name,
+                region=region,
+                root_prefix=root_prefix,
+                max_pool=max_pool,
+            ),
+            validate=validate,
         )
 
     @classmethod
     def from_azure(
-        cls, container_name: Optional[str] = None, root_prefix: Optional[str] = None
+        cls,
+        container_name: Optional[str] = None,
+        root_prefix: Optional[str] = None,
+        max_pool: Optional[int] = None,
+        validate: bool = True,
     ) -> "ModelStore":
         """Creates a ModelStore instance that stores models to an
         Azure blob container. This assumes that the container
-        already exists."""
+        already exists.
+
+        The client keeps up to max_pool connections open. If validate is
+        False, the container is not checked when the ModelStore is created."""
         if not AZURE_EXISTS:
             raise ModuleNotFoundError("azure-storage-blob is not installed!")
         return ModelStore(
             storage=AzureBlobStorage(
-                container_name=container_name, root_prefix=root_prefix
-            )
+                container_name=container_name,
+                root_prefix=root_prefix,
+                max_pool=max_pool,
+            ),
+            validate=validate,
         )
 
     @classmethod
@@ -75,16 +106,31 @@ class ModelStore:
         project_name: Optional[str] = None,
         bucket_name: Optional[str] = None,
         root_prefix: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        max_pool: Optional[int] = None,
+        validate: bool = True,
     ) -> "ModelStore":
         """Creates a ModelStore instance that stores models to a
         Google Cloud Bucket. This assumes that the Cloud bucket
-        already exists."""
+        already exists.
+
+        Large archives are transferred in chunks of chunk_size bytes,
+        using up to max_workers threads. The client keeps up to
+        max_pool connections open. If validate is False, the bucket
+        is not checked when the ModelStore is created."""
         if not GCLOUD_EXISTS:
             raise ModuleNotFoundError("google.cloud is not installed!")
         return ModelStore(
             storage=GoogleCloudStorage(
-                project_name, bucket_name, root_prefix=root_prefix
-            )
+                project_name,
+                bucket_name,
+                root_prefix=root_prefix,
+                max_workers=max_workers,
+                chunk_size=chunk_size,
+                max_pool=max_pool,
+            ),
+            validate=validate,
         )
 
     @classmethod
@@ -93,18 +139,28 @@ class ModelStore:
         the local file system."""
         return ModelStore(storage=FileSystemStorage(root_directory, create_directory))
 
-    def __post_init__(self):
-        if not self.storage.validate():
-            raise Exception(
-                f"Failed to set up the {type(self.storage).__name__} storage."
-            )
+    def __post_init__(self, validate: bool):
+        if validate:
+            self._validate_storage()
         # Add attributes for ML libraries that exist in the current
         # environment
-        libraries = []
+        libraries = {}
         for library, manager in iter_libraries(self.storage):
             object.__setattr__(self, library, manager)
-            libraries.append(manager)
-        object.__setattr__(self, "_libraries", libraries)
+            libraries[library] = manager
+        object.__setattr__(self, "_libraries", list(libraries.values()))
+        object.__setattr__(self, "_libraries_by_name", libraries)
+
+    def _validate_storage(self):
+        storage_key = _get_storage_key(self.storage)
+        if storage_key in _VALIDATED_STORAGE:
+            return
+        if not self.storage.validate():
+            raise Exception(
+                f"Failed to set up the {type(self.storage).__name__} storage."
+            )
+        if storage_key is not None:
+            _VALIDATED_STORAGE.add(storage_key)
 
     """
     DOMAINS: a domain is a string that is used to group several models together
@@ -207,20 +263,36 @@ class ModelStore:
         meta_data = self.get_model_info(domain, model_id)
         ml_library = meta_data["model"]["model_type"]["library"]
         if ml_library == MultipleModelsManager.NAME:
-            manager = MultipleModelsManager([], self.storage)
+            managers = [
+                self._get_manager(model_type["library"])
+                for model_type in meta_data["model"]["model_type"]["models"]
+            ]
+            manager = MultipleModelsManager(managers, self.storage)
         else:
-            manager = get_manager(ml_library, self.storage)
+            manager = self._get_manager(ml_library)
         with tempfile.TemporaryDirectory() as tmp_dir:
             model_files = self.download(tmp_dir, domain, model_id)
             return manager.load(model_files, meta_data)
 
+    def _get_manager(self, ml_library: str) -> ModelManager:
+        """Returns the store's manager for ml_library"""
+        manager = self._libraries_by_name.get(ml_library)
+        if manager is None or isinstance(manager, MissingDepManager):
+            raise ValueError(
+                f"could not create manager for {ml_library}: "
+                + "dependencies not installed"
+            )
+        return manager
+
     def download(self, local_path: str, domain: str, model_id: str = None) -> str:
         """Downloads the model a domain to local_path"""
         local_path = os.path.abspath(local_path)
-        archive_path = self.storage.download(local_path, domain, model_id)
-        with tarfile.open(archive_path, "r:gz") as tar:
-            tar.extractall(local_path)
-        os.remove(archive_path)
+        # The archive is extracted as it is streamed from storage,
+        # instead of being saved to disk first; the stream is read
+        # sequentially, so the concurrent, chunked downloads in the
+        # storage's download() are not used here
+        with closing(self.storage.download_stream(domain, model_id)) as archive:
+            extract_archive(archive, local_path)
         return local_path
 
     def delete_model(self, domain: str, model_id: str, skip_prompt: bool = False):
@@ -229,15 +301,56 @@ class ModelStore:
         self.storage.delete_model(domain, model_id, meta_data, skip_prompt)
 
 
-    def check_model_exists(self, domain: str, model_id: str):
-        #TODO: use head_object instead of full pull 
-        
-        try:
-            self.storage.get_meta_data(domain, model_id)
-            return True
-        except ModelNotFoundException:
-            pass
-        except FilePullFailedException:
-            pass
+    def check_model_exists(self, domain: str, model_id: str) -> bool:
+        """Returns whether a model exists in a domain; this only checks
+        that its meta-data exists, without downloading it"""
+        return self.storage.exists(domain, model_id)
+
+    """
+    ASYNC: the storage clients are synchronous, so these coroutines run the
+    functions above in the event loop's default executor. This lets async
+    applications make many requests concurrently without blocking the loop.
+    """
+
+    async def list_domains_async(self) -> list:
+        """Async version of `list_domains()`"""
+        return await self._run_in_executor(self.list_domains)
+
+    async def list_models_async(
+        self, domain: str, state_name: Optional[str] = None
+    ) -> list:
+        """Async version of `list_models()`"""
+        return await self._run_in_executor(self.list_models, domain, state_name)
+
+    async def get_model_info_async(self, domain: str, model_id: str) -> dict:
+        """Async version of `get_model_info()`"""
+        return await self._run_in_executor(self.get_model_info, domain, model_id)
+
+    async def get_models_info_async(self, domain: str, model_ids: list) -> list:
+        """Returns the meta-data for several models in a domain,
+        which are all requested concurrently"""
+        return await asyncio.gather(
+            *[self.get_model_info_async(domain, model_id) for model_id in model_ids]
+        )
+
+    async def download_async(
+        self, local_path: str, domain: str, model_id: str = None
+    ) -> str:
+        """Async version of `download()`"""
+        return await self._run_in_executor(self.download, local_path, domain, model_id)
 
-        return False
+    async def _run_in_executor(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args))
+
+
+def _get_storage_key(storage: CloudStorage) -> Optional[tuple]:
+    """Returns a key that identifies a cloud bucket or container, or None
+    if the storage's validation should not be cached. The file system is
+    always validated, as that is a local check that may create its directory
+    """
+    for attribute in ["bucket_name", "container_name"]:
+        location = getattr(storage, attribute, None)
+        if location is not None:
+            return type(storage).__name__, location
+    return None
@@ -11,9 +11,10 @@
 #    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
+import functools
+import importlib.util
 from typing import Iterator, List
 
-from modelstore.meta.dependencies import module_exists
 from modelstore.models.annoy import AnnoyManager
 from modelstore.models.catboost import CatBoostManager
 from modelstore.models.fastai import FastAIManager
@@ -60,16 +61,36 @@ _LIBRARIES = {
 }
 
 
+def _is_installed(modname: str) -> bool:
+    """Returns whether a module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(modname) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def _available_library_classes() -> frozenset:
+    """Returns the names of the ModelManagers whose dependencies are
+    installed in the current environment. This is computed once, as
+    checking for dependencies is slow."""
+    available = set()
+    for name, library in _LIBRARIES.items():
+        if all(_is_installed(x) for x in library().required_dependencies()):
+            available.add(name)
+    return frozenset(available)
+
+
 def iter_libraries(storage: CloudStorage = None) -> Iterator[ModelManager]:
     """Iterates of a dict of ModelManagers and yields
     the ones that are available in the current environment,
     based on checking for dependencies.
     """
+    available = _available_library_classes()
     for name, library in _LIBRARIES.items():
-        manager = library(storage)
-        if all(module_exists(x) for x in manager.required_dependencies()):
+        if name in available:
             logger.debug("Adding: %s", name)
-            yield name, manager
+            yield name, library(storage)
         else:
             logger.debug("Skipping: %s, not installed.", name)
             yield name, MissingDepManager(name, storage)
@@ -83,9 +104,8 @@ def matching_managers(managers: list, **kwargs) -> List[ModelManager]:
 
 
 def get_manager(name: str, storage: CloudStorage = None) -> ModelManager:
-    manager = _LIBRARIES[name](storage)
-    if all(module_exists(x) for x in manager.required_dependencies()):
-        return manager
+    if name in _available_library_classes():
+        return _LIBRARIES[name](storage)
     raise ValueError(
         "could not create manager for %s: dependencies not installed", name
     )
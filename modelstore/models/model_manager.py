@@ -13,7 +13,6 @@
 #    limitations under the License.
 import os
 import shutil
-import tarfile
 import tempfile
 import uuid
 from abc import ABC, ABCMeta, abstractmethod
@@ -23,6 +22,7 @@ import numpy as np
 from modelstore.meta import metadata
 from modelstore.meta.dependencies import save_dependencies, save_model_info
 from modelstore.storage.storage import CloudStorage
+from modelstore.utils.archives import create_archive
 
 
 class ModelManager(ABC):
@@ -151,7 +151,7 @@ class ModelManager(ABC):
         archive_name = "artifacts.tar.gz"
         with tempfile.TemporaryDirectory() as tmp_dir:
             result = os.path.join(tmp_dir, archive_name)
-            with tarfile.open(result, "w:gz") as tar:
+            with create_archive(result) as tar:
                 # Add all of the model files to the top-level
                 # of the archive
                 for file_path in self._collect_files(tmp_dir, **kwargs):
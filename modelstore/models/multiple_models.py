@@ -74,8 +74,11 @@ class MultipleModelsManager(ModelManager):
 
     def load(self, model_path: str, meta_data: dict) -> Any:
         models = {}
+        managers = {manager.ml_library: manager for manager in self.managers}
         for model_type in meta_data["model"]["model_type"]["models"]:
             ml_library = model_type["library"]
-            manager = get_manager(ml_library, self.storage)
+            manager = managers.get(ml_library)
+            if manager is None:
+                manager = get_manager(ml_library, self.storage)
             models[ml_library] = manager.load(model_path, meta_data)
         return models
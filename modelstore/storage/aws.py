@@ -13,22 +13,29 @@
 #    limitations under the License.
 import json
 import os
-from typing import Optional
+from typing import BinaryIO, Optional
 
 from modelstore.storage.blob_storage import BlobStorage
-from modelstore.storage.util import environment
-from modelstore.storage.util.versions import sorted_by_created
+from modelstore.storage.util import environment, serialize
 from modelstore.utils.log import logger
 from modelstore.utils.exceptions import FilePullFailedException
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
     from botocore.exceptions import ClientError
 
     BOTO_EXISTS = True
 except ImportError:
     BOTO_EXISTS = False
 
+_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB
+_MAX_CONCURRENCY = 16
+
+# botocore only keeps 10 connections open by default
+_MAX_POOL_CONNECTIONS = 64
+
 
 class AWSStorage(BlobStorage):
 
@@ -57,6 +64,7 @@ class AWSStorage(BlobStorage):
         bucket_name: Optional[str] = None,
         region: Optional[str] = None,
         root_prefix: Optional[str] = None,
+        max_pool: Optional[int] = None,
     ):
         super().__init__(["boto3"], root_prefix, "MODEL_STORE_AWS_ROOT_PREFIX")
         # If arguments are None, try to populate them using environment variables
@@ -64,23 +72,41 @@ class AWSStorage(BlobStorage):
         self.region = environment.get_value(
             region, "MODEL_STORE_REGION", allow_missing=True
         )
+        self.max_pool = max_pool if max_pool is not None else _MAX_POOL_CONNECTIONS
         self.__client = None
+        self.__transfer_config = None
 
     @property
     def client(self):
         try:
             if self.__client is None:
-                self.__client = boto3.client("s3", region_name=self.region)
+                self.__client = boto3.client(
+                    "s3",
+                    region_name=self.region,
+                    config=Config(max_pool_connections=self.max_pool),
+                )
             return self.__client
         except ClientError:
             logger.error("Unable to create s3 client!")
             raise
 
+    @property
+    def transfer_config(self) -> "TransferConfig":
+        """Files that are larger than the chunk size are
+        transferred in parts, using multiple threads"""
+        if self.__transfer_config is None:
+            self.__transfer_config = TransferConfig(
+                multipart_threshold=_CHUNK_SIZE,
+                multipart_chunksize=_CHUNK_SIZE,
+                max_concurrency=_MAX_CONCURRENCY,
+                use_threads=True,
+            )
+        return self.__transfer_config
+
     def validate(self) -> bool:
         logger.debug("Querying for buckets with prefix=%s...", self.bucket_name)
         try:
-            resource = boto3.resource("s3")
-            resource.meta.client.head_bucket(Bucket=self.bucket_name)
+            self.client.head_bucket(Bucket=self.bucket_name)
             return True
         except ClientError:
             logger.error("Unable to access bucket: %s", self.bucket_name)
@@ -88,21 +114,76 @@ class AWSStorage(BlobStorage):
 
     def _push(self, source: str, destination: str) -> str:
         logger.info("Uploading to: %s...", destination)
-        self.client.upload_file(source, self.bucket_name, destination)
+        self.client.upload_file(
+            source, self.bucket_name, destination, Config=self.transfer_config
+        )
+        return destination
+
+    def _push_bytes(self, data: bytes, destination: str) -> str:
+        logger.info("Uploading to: %s...", destination)
+        self.client.put_object(Bucket=self.bucket_name, Key=destination, Body=data)
         return destination
 
+    def _copy(self, source: str, destination: str) -> str:
+        """Copies an object within the bucket, without downloading it"""
+        try:
+            logger.debug("Copying from: %s to: %s...", source, destination)
+            self.client.copy_object(
+                Bucket=self.bucket_name,
+                Key=destination,
+                CopySource={"Bucket": self.bucket_name, "Key": source},
+            )
+            return destination
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ["404", "NoSuchKey"]:
+                raise FilePullFailedException(e)
+            raise e
+
     def _pull(self, source: str, destination: str) -> str:
         try:
             logger.debug("Downloading from: %s...", source)
             file_name = os.path.split(source)[1]
             destination = os.path.join(destination, file_name)
-            self.client.download_file(self.bucket_name, source, destination)
+            self.client.download_file(
+                self.bucket_name, source, destination, Config=self.transfer_config
+            )
             return destination
         except ClientError as e:
             if int(e.response["Error"]["Code"]) == 404:
                 raise FilePullFailedException(e)
             raise e
 
+    def _open(self, source: str) -> BinaryIO:
+        """Opens an s3 object as a readable, file-like object
+        that streams the object's body"""
+        try:
+            obj = self.client.get_object(Bucket=self.bucket_name, Key=source)
+            return obj["Body"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ["404", "NoSuchKey"]:
+                raise FilePullFailedException(e)
+            raise e
+
+    def _read_bytes(self, source: str) -> bytes:
+        return self._open(source).read()
+
+    def _exists(self, path: str) -> bool:
+        """Returns whether an object exists, using a HEAD request"""
+        try:
+            self.client.head_object(Bucket=self.bucket_name, Key=path)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ["404", "NoSuchKey"]:
+                return False
+            raise
+
+    def _list_prefix(self, path: str) -> list:
+        paths = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=path + "/"):
+            paths.extend(obj["Key"] for obj in page.get("Contents", []))
+        return paths
+
     def _remove(self, destination: str) -> bool:
         """Removes a file from the destination path"""
         try:
@@ -130,30 +211,11 @@ class AWSStorage(BlobStorage):
             raise ValueError("Meta-data has a different bucket name")
         return meta["prefix"]
 
-    def _read_json_objects(self, path: str) -> list:
-        logger.debug("Listing files in: %s/%s", self.bucket_name, path)
-        results = []
-        objects = self.client.list_objects_v2(Bucket=self.bucket_name, Prefix=path)
-        for version in objects.get("Contents", []):
-            object_path = version["Key"]
-            if not object_path.endswith(".json"):
-                logger.debug("Skipping non-json file: %s", object_path)
-                continue
-            if os.path.split(object_path)[0] != path:
-                # We don't want to read files in a sub-prefix
-                logger.debug("Skipping file in sub-prefix: %s", object_path)
-                continue
-
-            obj = self._read_json_object(object_path)
-            if obj is not None:
-                results.append(obj)
-        return sorted_by_created(results)
-
     def _read_json_object(self, path: str) -> dict:
         logger.debug("Reading: %s/%s", self.bucket_name, path)
         obj = self.client.get_object(Bucket=self.bucket_name, Key=path)
         body = obj["Body"].read()
         try:
-            return json.loads(body)
+            return serialize.loads(body)
         except json.JSONDecodeError:
             return None
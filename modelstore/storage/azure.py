@@ -11,24 +11,40 @@
 #    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
+import io
 import json
 import os
-from typing import Optional
+import time
+from typing import BinaryIO, Iterator, Optional
 
 from modelstore.storage.blob_storage import BlobStorage
-from modelstore.storage.util import environment
-from modelstore.storage.util.versions import sorted_by_created
+from modelstore.storage.util import environment, serialize
 from modelstore.utils.log import logger
 from modelstore.utils.exceptions import FilePullFailedException
 
 try:
     from azure.storage.blob import BlobServiceClient
     from azure.core.exceptions import ResourceNotFoundError
+    from azure.core.pipeline.transport import RequestsTransport
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 
     AZURE_EXISTS = True
 except ImportError:
     AZURE_EXISTS = False
 
+_MAX_CONCURRENCY = 8
+
+# The default connection pool of a requests.Session only
+# keeps 10 connections open
+_POOL_CONNECTIONS = 32
+_MAX_POOL_SIZE = 64
+
+# Copies within a container are usually complete when they are started;
+# any that are pending are polled until they finish
+_COPY_POLL_INTERVAL = 0.1  # seconds
+
 
 class AzureBlobStorage(BlobStorage):
 
@@ -58,6 +74,7 @@ class AzureBlobStorage(BlobStorage):
         root_prefix: Optional[str] = None,
         client: "azure.storage.blobage.BlobClient" = None,
         environ_key: str = "AZURE_STORAGE_CONNECTION_STRING",
+        max_pool: Optional[int] = None,
     ):
         super().__init__(
             ["azure.storage.blob"], root_prefix, "MODEL_STORE_AZURE_ROOT_PREFIX"
@@ -67,7 +84,9 @@ class AzureBlobStorage(BlobStorage):
             container_name, "MODEL_STORE_AZURE_CONTAINER"
         )
         self.connection_string_key = environ_key
+        self.max_pool = max_pool if max_pool is not None else _MAX_POOL_SIZE
         self.__client = client
+        self.__container_client = None
 
     @property
     def client(self) -> "azure.storage.blobage.BlobClient":
@@ -77,11 +96,31 @@ class AzureBlobStorage(BlobStorage):
             raise Exception(f"{self.connection_string_key} is not in os.environ")
         if self.__client is None:
             connect_str = os.environ[self.connection_string_key]
-            self.__client = BlobServiceClient.from_connection_string(connect_str)
+            self.__client = BlobServiceClient.from_connection_string(
+                connect_str, transport=self._create_transport()
+            )
         return self.__client
 
+    def _create_transport(self) -> "RequestsTransport":
+        """Creates a transport with a larger connection pool, so that
+        connections are re-used by concurrent requests"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=_POOL_CONNECTIONS,
+            pool_maxsize=self.max_pool,
+            # Retries are made by the azure pipeline, not by requests
+            max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return RequestsTransport(session=session)
+
     def _container_client(self):
-        return self.client.get_container_client(self.container_name)
+        if self.__container_client is None:
+            self.__container_client = self.client.get_container_client(
+                self.container_name
+            )
+        return self.__container_client
 
     def _blob_client(self, blob_name: str):
         blob_client = self._container_client().get_blob_client(blob_name)
@@ -108,7 +147,33 @@ class AzureBlobStorage(BlobStorage):
         blob_client = self._blob_client(destination)
 
         with open(source, "rb") as data:
-            blob_client.upload_blob(data, overwrite=True)
+            blob_client.upload_blob(
+                data, overwrite=True, max_concurrency=_MAX_CONCURRENCY
+            )
+        return destination
+
+    def _push_bytes(self, data: bytes, destination: str) -> str:
+        logger.info("Uploading to: %s...", destination)
+        self._blob_client(destination).upload_blob(data, overwrite=True)
+        return destination
+
+    def _copy(self, source: str, destination: str) -> str:
+        """Copies a blob within the container, without downloading it.
+        This is an asynchronous copy, which (unlike a synchronous copy from
+        a URL) is authorized with the same credentials as the client"""
+        try:
+            logger.debug("Copying from: %s to: %s...", source, destination)
+            blob_client = self._blob_client(destination)
+            copy = blob_client.start_copy_from_url(self._blob_client(source).url)
+            status = copy["copy_status"]
+            while status == "pending":
+                time.sleep(_COPY_POLL_INTERVAL)
+                status = blob_client.get_blob_properties().copy.status
+        except ResourceNotFoundError as e:
+            raise FilePullFailedException(e)
+        if status != "success":
+            logger.debug("Copy to %s ended with status=%s", destination, status)
+            return self._push_bytes(self._read_bytes(source), destination)
         return destination
 
     def _pull(self, source: str, destination: str) -> str:
@@ -118,11 +183,37 @@ class AzureBlobStorage(BlobStorage):
             blob_client = self._blob_client(source)
             target = os.path.join(destination, os.path.split(source)[1])
             with open(target, "wb") as download_file:
-                download_file.write(blob_client.download_blob().readall())
+                blob_client.download_blob(max_concurrency=_MAX_CONCURRENCY).readinto(
+                    download_file
+                )
             return target
         except ResourceNotFoundError as e:
             raise FilePullFailedException(e)
 
+    def _open(self, source: str) -> BinaryIO:
+        """Opens a blob as a readable, file-like object that
+        downloads the blob in chunks as it is read"""
+        try:
+            blob_client = self._blob_client(source)
+            chunks = blob_client.download_blob().chunks()
+            return io.BufferedReader(_ChunksReader(chunks))
+        except ResourceNotFoundError as e:
+            raise FilePullFailedException(e)
+
+    def _read_bytes(self, source: str) -> bytes:
+        try:
+            return self._blob_client(source).download_blob().readall()
+        except ResourceNotFoundError as e:
+            raise FilePullFailedException(e)
+
+    def _exists(self, path: str) -> bool:
+        """Returns whether a blob exists, using a properties-only request"""
+        return self._blob_client(path).exists()
+
+    def _list_prefix(self, path: str) -> list:
+        blobs = self._container_client().list_blobs(name_starts_with=path + "/")
+        return [blob.name for blob in blobs]
+
     def _remove(self, destination: str) -> bool:
         """Removes a file from the destination path"""
         blob_client = self._blob_client(destination)
@@ -146,29 +237,35 @@ class AzureBlobStorage(BlobStorage):
             raise ValueError("Meta-data has a different container name")
         return meta["prefix"]
 
-    def _read_json_objects(self, path: str) -> list:
-        logger.debug("Listing files in: %s/%s", self.container_name, path)
-        results = []
-        blobs = self._container_client().list_blobs(name_starts_with=path + "/")
-        for blob in blobs:
-            if not blob.name.endswith(".json"):
-                logger.debug("Skipping non-json file: %s", blob.name)
-                continue
-            if os.path.split(blob.name)[0] != path:
-                # We don't want to read files in a sub-prefix
-                logger.debug("Skipping file in sub-prefix: %s", blob.name)
-                continue
-            blob_client = self._blob_client(blob)
-            obj = blob_client.download_blob().readall()
-            if obj is not None:
-                results.append(json.loads(obj))
-        return sorted_by_created(results)
-
     def _read_json_object(self, path: str) -> dict:
         """Returns a dictionary of the JSON stored in a given path"""
         blob_client = self._blob_client(path)
         body = blob_client.download_blob().readall()
         try:
-            return json.loads(body)
+            return serialize.loads(body)
         except json.JSONDecodeError:
             return None
+
+
+class _ChunksReader(io.RawIOBase):
+
+    """
+    A read-only, file-like object over an iterator of bytes,
+    e.g. the chunks of a blob that is being downloaded
+    """
+
+    def __init__(self, chunks: Iterator[bytes]):
+        super().__init__()
+        self._chunks = chunks
+        self._chunk = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if len(self._chunk) == 0:
+            self._chunk = memoryview(next(self._chunks, b""))
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
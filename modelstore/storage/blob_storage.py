@@ -11,19 +11,22 @@
 #    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
-import json
+import copy
 import os
-import tempfile
+import threading
+import time
 import click
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import BinaryIO, Callable, Optional
 
 from modelstore.storage.storage import CloudStorage
 from modelstore.storage.states.model_states import ReservedModelStates
-from modelstore.storage.util import environment
+from modelstore.storage.util import environment, serialize
+from modelstore.storage.util.versions import sorted_by_created
 from modelstore.storage.util.paths import (
-    get_archive_path,
+    MODELSTORE_ROOT_PREFIX,
     get_domain_path,
     get_domains_path,
     get_model_state_path,
@@ -35,6 +38,7 @@ from modelstore.storage.states.model_states import (
     is_reserved_state,
     ReservedModelStates,
 )
+from modelstore.utils.cache import TTLCache
 from modelstore.utils.log import logger
 from modelstore.utils.exceptions import (
     DomainNotFoundException,
@@ -43,6 +47,29 @@ from modelstore.utils.exceptions import (
     FilePullFailedException,
 )
 
+# The maximum number of concurrent requests when reading many objects;
+# this can be changed with the MODEL_STORE_MAX_WORKERS environment variable
+_MAX_WORKERS = 16
+
+# JSON files that are pulled from storage are cached in memory; files
+# that do not exist are also cached, for a shorter amount of time. Changes
+# made by other processes (e.g., a new latest model) may not be seen until
+# the cache expires; this can be changed with the MODEL_STORE_META_CACHE_TTL
+# environment variable, and setting it to 0 disables caching
+_META_CACHE_SIZE = 256
+_META_CACHE_TTL = 60  # seconds
+_MISSING_TTL = 5  # seconds
+_MISSING = object()
+
+# Whether a (domain, model_id) that has no meta-data was deleted or never
+# existed is also cached, so that looking it up again does not need to
+# pull from the model's path and then from the deleted state's path
+_TOMBSTONES_SIZE = 1024
+
+# The meta-data of the most recent models in a domain is cached when
+# the domain's models are listed, as it is likely to be read next
+_PREFETCH_SIZE = 8
+
 
 class BlobStorage(CloudStorage):
 
@@ -66,26 +93,137 @@ class BlobStorage(CloudStorage):
             )
         self.root_prefix = root_prefix if root_prefix is not None else ""
         logger.debug("Root prefix is: %s", self.root_prefix)
+        meta_cache_ttl = environment.get_value(
+            None, "MODEL_STORE_META_CACHE_TTL", allow_missing=True
+        )
+        meta_cache_ttl = float(meta_cache_ttl) if meta_cache_ttl else _META_CACHE_TTL
+        self._missing_ttl = min(_MISSING_TTL, meta_cache_ttl)
+        self._meta_cache = TTLCache(_META_CACHE_SIZE, ttl=meta_cache_ttl)
+        self._tombstones = TTLCache(_TOMBSTONES_SIZE, ttl=meta_cache_ttl)
+        max_workers = environment.get_value(
+            None, "MODEL_STORE_MAX_WORKERS", allow_missing=True
+        )
+        self._max_workers = int(max_workers) if max_workers else _MAX_WORKERS
+        # The pool is created the first time that it is used
+        self._io_pool = None
+        self._io_pool_lock = threading.Lock()
+        self._closed = False
+        # Whether independent files can be pushed concurrently; this is only
+        # worth doing when each push is a network request
+        self._supports_parallel_put = True
+
+    def close(self):
+        """Shuts down the threads that are used to make concurrent requests"""
+        with self._io_pool_lock:
+            self._closed = True
+            if self._io_pool is not None:
+                self._io_pool.shutdown(wait=True)
+
+    def __del__(self):
+        # The pool may not exist if __init__() raised an exception
+        io_pool = getattr(self, "_io_pool", None)
+        if io_pool is not None:
+            io_pool.shutdown(wait=False)
+
+    def __getstate__(self) -> dict:
+        # Thread pools and locks can't be pickled, so they are created
+        # again when the storage is unpickled (e.g., in another process)
+        state = self.__dict__.copy()
+        del state["_io_pool"]
+        del state["_io_pool_lock"]
+        del state["_closed"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._io_pool = None
+        self._io_pool_lock = threading.Lock()
+        self._closed = False
+
+    def _get_io_pool(self) -> ThreadPoolExecutor:
+        with self._io_pool_lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="modelstore",
+                )
+            return self._io_pool
+
+    @property
+    def root_prefix(self) -> str:
+        return self._root_prefix
+
+    @root_prefix.setter
+    def root_prefix(self, root_prefix: str):
+        self._root_prefix = root_prefix
+        # The part of every archive path that does not change is
+        # computed once, instead of on every upload
+        self._archive_root = os.path.join(root_prefix, MODELSTORE_ROOT_PREFIX)
+        self._path_cache = {}
 
     @abstractmethod
     def _push(self, source: str, destination: str) -> str:
         """Pushes a file from a source to a destination"""
         raise NotImplementedError()
 
+    @abstractmethod
+    def _push_bytes(self, data: bytes, destination: str) -> str:
+        """Pushes data that is in memory to a destination"""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _copy(self, source: str, destination: str) -> str:
+        """Copies a remote file to another remote destination"""
+        raise NotImplementedError()
+
     @abstractmethod
     def _pull(self, source: str, destination: str) -> str:
         """Pulls a model from a source to a destination"""
         raise NotImplementedError()
 
+    @abstractmethod
+    def _open(self, source: str) -> BinaryIO:
+        """Opens a remote file as a readable, file-like object"""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _read_bytes(self, source: str) -> bytes:
+        """Reads the contents of a remote file into memory"""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _exists(self, path: str) -> bool:
+        """Returns whether a file exists at the given path"""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _list_prefix(self, path: str) -> list:
+        """Returns the paths of all of the files under a path,
+        including the ones that are in sub-directories"""
+        raise NotImplementedError()
+
     @abstractmethod
     def _remove(self, destination: str) -> bool:
         """Removes a file from the destination path"""
         raise NotImplementedError()
 
-    @abstractmethod
     def _read_json_objects(self, path: str) -> list:
-        """Returns a list of all the JSON in a path"""
-        raise NotImplementedError()
+        """Returns a list of all the JSON in a path, excluding any JSON that
+        is in its sub-directories; the files are read concurrently"""
+        object_paths = []
+        for object_path in self._list_prefix(path):
+            if not object_path.endswith(".json"):
+                logger.debug("Skipping non-json file: %s", object_path)
+                continue
+            if os.path.split(object_path)[0] != path:
+                # We don't want to read files in a sub-prefix
+                logger.debug("Skipping file in sub-prefix: %s", object_path)
+                continue
+            object_paths.append(object_path)
+        results = self._map(self._read_json_object, object_paths)
+        return sorted_by_created([obj for obj in results if obj is not None])
 
     @abstractmethod
     def _read_json_object(self, path: str) -> dict:
@@ -102,6 +240,23 @@ class BlobStorage(CloudStorage):
         """Extracts the storage location from a meta data dictionary"""
         raise NotImplementedError()
 
+    def _map(self, func: Callable, items: list) -> list:
+        """Applies func to all of the items, using a pool of threads;
+        this is used to fan out I/O-bound requests to storage"""
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        return list(self._get_io_pool().map(func, items))
+
+    def _models_path(self, domain: str, state_name: Optional[str] = None) -> str:
+        """Returns get_models_path() for this storage's root prefix; the
+        paths are memoized, since they are rebuilt for every model"""
+        key = (domain, state_name)
+        models_path = self._path_cache.get(key)
+        if models_path is None:
+            models_path = get_models_path(self.root_prefix, domain, state_name)
+            self._path_cache[key] = models_path
+        return models_path
+
     def _get_metadata_path(
         self, domain: str, model_id: str, state_name: Optional[str] = None
     ) -> str:
@@ -115,31 +270,45 @@ class BlobStorage(CloudStorage):
             model_id (str): A UUID4 string that identifies this specific
             model.
         """
-        return os.path.join(
-            get_models_path(self.root_prefix, domain, state_name), f"{model_id}.json"
-        )
+        return f"{self._models_path(domain, state_name)}/{model_id}.json"
 
     def upload(self, domain: str, local_path: str) -> dict:
         # Upload the archive into storage
-        archive_remote_path = get_archive_path(self.root_prefix, domain, local_path)
+        # This is equivalent to get_archive_path()
+        file_name = os.path.basename(local_path)
+        prefix = datetime.now().strftime("%Y.%m.%d-%H.%M.%S")
+        archive_remote_path = f"{self._archive_root}/{domain}/{prefix}/{file_name}"
         prefix = self._push(local_path, archive_remote_path)
         return self._storage_location(prefix)
 
+    def _get_archive_location(self, domain: str, model_id: str = None) -> str:
+        """Returns the remote path of the artifacts archive for a given
+        (domain, model_id) pair. If no model_id is given, it defaults to
+        the latest model in that domain"""
+        if model_id is None:
+            # The domain's meta-data is a copy of the latest model's
+            # meta-data (see set_meta_data()), so it is used directly
+            model_meta = self.get_domain(domain)
+            logger.info("Latest model is: %s", model_meta["model"]["model_id"])
+        else:
+            model_meta = self.get_meta_data(domain, model_id)
+        return self._get_storage_location(model_meta["storage"])
+
     def download(self, local_path: str, domain: str, model_id: str = None):
         """Downloads an artifacts archive for a given (domain, model_id) pair.
         If no model_id is given, it defaults to the latest model in that
         domain"""
-        model_meta = None
-        if model_id is None:
-            model_domain = get_domain_path(self.root_prefix, domain)
-            model_meta = self._read_json_object(model_domain)
-            model_id = model_meta["model"]["model_id"]
-            logger.info("Latest model is: %s", model_id)
-
-        model_meta = self.get_meta_data(domain, model_id)
-        storage_path = self._get_storage_location(model_meta["storage"])
+        storage_path = self._get_archive_location(domain, model_id)
         return self._pull(storage_path, local_path)
 
+    def download_stream(self, domain: str, model_id: str = None) -> BinaryIO:
+        """Returns a readable, file-like object of the artifacts archive
+        for a given (domain, model_id) pair. If no model_id is given, it
+        defaults to the latest model in that domain"""
+        storage_path = self._get_archive_location(domain, model_id)
+        logger.debug("Streaming from: %s...", storage_path)
+        return self._open(storage_path)
+
     def delete_model(
         self, domain: str, model_id: str, meta_data: dict, skip_prompt: bool = False
     ):
@@ -162,8 +331,7 @@ class BlobStorage(CloudStorage):
         # all custom states, setting it to a reserved state, and then deleting
         # the main meta-data file
         logger.debug("Removing model from all states %s=%s", domain, model_id)
-        for state_name in self.list_model_states():
-            self.unset_model_state(domain, model_id, state_name)
+        self._remove_from_all_states(domain, model_id)
 
         logger.debug("Setting to state=deleted %s=%s", domain, model_id)
         self.set_model_state(domain, model_id, ReservedModelStates.DELETED.value)
@@ -171,11 +339,32 @@ class BlobStorage(CloudStorage):
         logger.debug("Deleting meta-data for %s=%s", domain, model_id)
         remote_path = self._get_metadata_path(domain, model_id)
         self._remove(remote_path)
+        self._meta_cache.pop(remote_path)
+        self._tombstones.set((domain, model_id), True)
 
         # @TODO (future): the model that is being deleted may be also set
         # as the "latest" model in a domain; this will cause download() to fail
         # if a model_id is not provided
 
+    def _remove_from_all_states(self, domain: str, model_id: str):
+        """Removes a model's meta-data from all of the non-reserved states
+        that it is in. The domain's versions are listed once to find those
+        states, instead of trying to remove the model from every state"""
+        models_path = self._models_path(domain)
+        file_name = f"{model_id}.json"
+        for path in self._list_prefix(models_path):
+            state_path, path_name = os.path.split(path)
+            state_name = os.path.relpath(state_path, models_path)
+            if path_name != file_name or state_name == os.curdir:
+                continue
+            if is_reserved_state(state_name):
+                continue
+            self._meta_cache.pop(path)
+            self._remove(path)
+            logger.debug(
+                "Successfully unset %s=%s from state=%s", domain, model_id, state_name
+            )
+
     def list_domains(self) -> list:
         """Returns a list of all the existing model domains"""
         domains = get_domains_path(self.root_prefix)
@@ -189,27 +378,44 @@ class BlobStorage(CloudStorage):
         except FilePullFailedException:
             raise DomainNotFoundException(domain)
 
-    def list_models(self, domain: str, state_name: Optional[str] = None) -> list:
+    def list_models(
+        self, domain: str, state_name: Optional[str] = None, verify: bool = False
+    ) -> list:
+        """Returns a list of a model's versions; the domain is checked
+        with an existence request, unless verify=True, in which case its
+        meta-data is pulled and loaded"""
         if state_name and not self.state_exists(state_name):
             raise Exception(f"State: '{state_name}' does not exist")
-        _ = self.get_domain(domain)
-        models_path = get_models_path(self.root_prefix, domain, state_name)
+        if verify:
+            _ = self.get_domain(domain)
+        elif not self._domain_exists(domain):
+            raise DomainNotFoundException(domain)
+        models_path = self._models_path(domain, state_name)
         models = self._read_json_objects(models_path)
+        if state_name is None:
+            # The meta-data has already been read, so no further requests
+            # are needed to cache it
+            for meta_data in models[:_PREFETCH_SIZE]:
+                model_id = meta_data["model"]["model_id"]
+                remote_path = self._get_metadata_path(domain, model_id)
+                self._meta_cache.set(remote_path, meta_data)
         # @TODO sort models by creation time stamp
         return [v["model"]["model_id"] for v in models]
 
+    def _domain_exists(self, domain: str) -> bool:
+        remote_path = get_domain_path(self.root_prefix, domain)
+        meta_data = self._meta_cache.get(remote_path)
+        if meta_data is not None:
+            # The domain's meta-data has been pulled recently
+            return meta_data is not _MISSING
+        return self._exists(remote_path)
+
     def state_exists(self, state_name: str) -> bool:
         """Returns whether a model state with name state_name exists"""
-        try:
-            state_path = get_model_state_path(self.root_prefix, state_name)
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                self._pull(state_path, tmp_dir)
-            return True
-            # pylint: disable=broad-except,invalid-name
-        except Exception as e:
-            # @TODO - check the error type
-            logger.error("Error checking state: %s", str(e))
+        if not is_valid_state_name(state_name) and not is_reserved_state(state_name):
             return False
+        state_path = get_model_state_path(self.root_prefix, state_name)
+        return self._exists(state_path)
 
     def list_model_states(self) -> list:
         """Lists the model states that have been created"""
@@ -228,17 +434,13 @@ class BlobStorage(CloudStorage):
             logger.info("Model state '%s' already exists", state_name)
             return  # Exception is not raised; create_model_state() is idempotent
         logger.debug("Creating model state: %s", state_name)
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            state_data_path = os.path.join(tmp_dir, f"{state_name}.json")
-            with open(state_data_path, "w") as out:
-                state_data = {
-                    "created": datetime.now().strftime("%Y/%m/%d/%H:%M:%S"),
-                    "state_name": state_name,
-                }
-                out.write(json.dumps(state_data))
-            self._push(
-                state_data_path, get_model_state_path(self.root_prefix, state_name)
-            )
+        state_data = {
+            "created": time.strftime("%Y/%m/%d/%H:%M:%S"),
+            "state_name": state_name,
+        }
+        state_path = get_model_state_path(self.root_prefix, state_name)
+        self._push_bytes(serialize.dumps(state_data), state_path)
+        self._meta_cache.pop(state_path)
 
     def set_model_state(self, domain: str, model_id: str, state_name: str):
         """Adds the given model ID to the set that are in the state_name path"""
@@ -254,9 +456,8 @@ class BlobStorage(CloudStorage):
             raise ValueError(f"State '{state_name}' does not exist")
         model_path = self._get_metadata_path(domain, model_id)
         model_state_path = self._get_metadata_path(domain, model_id, state_name)
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            local_model_path = self._pull(model_path, tmp_dir)
-            self._push(local_model_path, model_state_path)
+        self._copy(model_path, model_state_path)
+        self._meta_cache.pop(model_state_path)
         logger.debug("Successfully set %s=%s to state=%s", domain, model_id, state_name)
 
     def unset_model_state(self, domain: str, model_id: str, state_name: str):
@@ -272,6 +473,7 @@ class BlobStorage(CloudStorage):
             logger.debug("Model state '%s' does not exist", state_name)
             raise ValueError(f"State '{state_name}' does not exist")
         model_state_path = self._get_metadata_path(domain, model_id, state_name)
+        self._meta_cache.pop(model_state_path)
         if self._remove(model_state_path):
             logger.debug(
                 "Successfully unset %s=%s from state=%s", domain, model_id, state_name
@@ -281,46 +483,57 @@ class BlobStorage(CloudStorage):
                 "Model  %s=%s was not set to state=%s", domain, model_id, state_name
             )
 
-    def _get_metadata_path(
-        self, domain: str, model_id: str, state_name: Optional[str] = None
-    ) -> str:
-        """Creates a path where a meta-data file about a model is stored.
-        I.e.: :code:`operatorai-model-store/<domain>/versions/<model-id>.json`
-
-        Args:
-            domain (str): A group of models that are trained for the
-            same end-use are given the same domain.
-
-            model_id (str): A UUID4 string that identifies this specific
-            model.
-        """
-        return os.path.join(
-            get_models_path(self.root_prefix, domain, state_name), f"{model_id}.json"
-        )
-
     def set_meta_data(self, domain: str, model_id: str, meta_data: dict):
         logger.debug("Setting meta-data for %s=%s", domain, model_id)
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            local_path = os.path.join(tmp_dir, f"{model_id}.json")
-            remote_path = self._get_metadata_path(domain, model_id)
-            with open(local_path, "w") as out:
-                out.write(json.dumps(meta_data))
-            self._push(local_path, remote_path)
-
+        # The meta-data is serialized once, and pushed to both paths
+        payload = serialize.dumps(meta_data)
+        self._tombstones.pop((domain, model_id))
+        remote_paths = [
+            self._get_metadata_path(domain, model_id),
             # @TODO this is setting the "latest" model implicitly
-            remote_path = get_domain_path(self.root_prefix, domain)
-            self._push(local_path, remote_path)
+            get_domain_path(self.root_prefix, domain),
+        ]
+        if self._supports_parallel_put:
+            self._map(lambda x: self._push_bytes(payload, x), remote_paths)
+        else:
+            for remote_path in remote_paths:
+                self._push_bytes(payload, remote_path)
+        # The cache is updated with what was written, so that reading this
+        # model's meta-data back does not need to pull it from storage
+        meta_data = serialize.loads(payload)
+        for remote_path in remote_paths:
+            self._meta_cache.set(remote_path, meta_data)
 
     def _pull_and_load(self, remote_path: str) -> dict:
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            local_path = self._pull(remote_path, tmp_dir)
-            with open(local_path, "r") as lines:
-                return json.loads(lines.read())
+        meta_data = self._meta_cache.get(remote_path)
+        if meta_data is _MISSING:
+            raise FilePullFailedException(f"File {remote_path} does not exist.")
+        if meta_data is None:
+            try:
+                meta_data = serialize.loads(self._read_bytes(remote_path))
+            except FilePullFailedException:
+                self._meta_cache.set(remote_path, _MISSING, ttl=self._missing_ttl)
+                raise
+            self._meta_cache.set(remote_path, meta_data)
+        # Callers get a copy, so that they can't modify the cached value
+        return copy.deepcopy(meta_data)
+
+    def exists(self, domain: str, model_id: str) -> bool:
+        """Returns whether a model's meta data exists, without
+        downloading it"""
+        if any(x in [None, ""] for x in [domain, model_id]):
+            raise ValueError("domain and model_id must be set")
+        return self._exists(self._get_metadata_path(domain, model_id))
 
     def get_meta_data(self, domain: str, model_id: str) -> dict:
         if any(x in [None, ""] for x in [domain, model_id]):
             raise ValueError("domain and model_id must be set")
         logger.debug("Retrieving meta-data for %s=%s", domain, model_id)
+        is_deleted = self._tombstones.get((domain, model_id))
+        if is_deleted is not None:
+            if is_deleted:
+                raise ModelDeletedException(domain, model_id)
+            raise ModelNotFoundException(domain, model_id)
         remote_path = self._get_metadata_path(domain, model_id)
         try:
             return self._pull_and_load(remote_path)
@@ -337,6 +550,8 @@ class BlobStorage(CloudStorage):
                     domain, model_id, ReservedModelStates.DELETED.value
                 )
                 self._pull_and_load(remote_path)
+                self._tombstones.set((domain, model_id), True)
                 raise ModelDeletedException(domain, model_id)
             except FilePullFailedException:
+                self._tombstones.set((domain, model_id), False, ttl=self._missing_ttl)
                 raise ModelNotFoundException(domain, model_id)
@@ -13,10 +13,10 @@
 #    limitations under the License.
 import json
 import os
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
 from modelstore.storage.blob_storage import BlobStorage
-from modelstore.storage.util import environment
+from modelstore.storage.util import environment, serialize
 from modelstore.storage.util.versions import sorted_by_created
 from modelstore.utils.log import logger
 from modelstore.utils.exceptions import FilePullFailedException
@@ -28,6 +28,8 @@ try:
     from google.cloud import storage
     from google.api_core.exceptions import NotFound
 
+    from requests.adapters import HTTPAdapter
+
     storage.blob._DEFAULT_CHUNKSIZE = 2097152  # 1024 * 1024 B * 2 = 2 MB
     storage.blob._MAX_MULTIPART_SIZE = 2097152  # 2 MB
 
@@ -35,6 +37,27 @@ try:
 except ImportError:
     GCLOUD_EXISTS = False
 
+try:
+    # The transfer_manager module was added in google-cloud-storage 2.7, but
+    # concurrent, chunked transfers were only added to it in 2.10
+    from google.cloud.storage import transfer_manager
+
+    TRANSFER_MANAGER_EXISTS = hasattr(transfer_manager, "upload_chunks_concurrently")
+except ImportError:
+    TRANSFER_MANAGER_EXISTS = False
+
+_DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB
+
+# The default connection pool of the client's HTTP session only keeps
+# 10 connections open, which is fewer than the number of concurrent requests
+_POOL_CONNECTIONS = 32
+_MAX_POOL_SIZE = 64
+
+# GCS limits the custom meta-data of an object to 8 KiB, so only JSON
+# files that are smaller than this are also stored inline
+_INLINE_JSON_KEY = "m"
+_INLINE_JSON_MAX_SIZE = 7 * 1024  # 7 KiB
+
 
 class GoogleCloudStorage(BlobStorage):
 
@@ -56,6 +79,9 @@ class GoogleCloudStorage(BlobStorage):
         bucket_name: Optional[str] = None,
         root_prefix: Optional[str] = None,
         client: "storage.Client" = None,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        max_pool: Optional[int] = None,
     ):
         super().__init__(
             ["google.cloud.storage"], root_prefix, "MODEL_STORE_GCP_ROOT_PREFIX"
@@ -65,7 +91,12 @@ class GoogleCloudStorage(BlobStorage):
         self.project_name = environment.get_value(
             project_name, "MODEL_STORE_GCP_PROJECT"
         )
+        self.max_workers = max_workers if max_workers is not None else os.cpu_count()
+        self.chunk_size = chunk_size if chunk_size is not None else _DEFAULT_CHUNK_SIZE
+        self.max_pool = max_pool if max_pool is not None else _MAX_POOL_SIZE
         self.__client = client
+        self.__bucket = None
+        self.__bucket_exists = False
 
     @property
     def client(self) -> "storage.Client":
@@ -73,7 +104,7 @@ class GoogleCloudStorage(BlobStorage):
             raise ImportError("Please install google-cloud-storage")
         try:
             if self.__client is None:
-                self.__client = storage.Client(self.project_name)
+                self.__client = self._create_client()
             return self.__client
         except DefaultCredentialsError:
             try:
@@ -82,7 +113,7 @@ class GoogleCloudStorage(BlobStorage):
                 from google.colab import auth
 
                 auth.authenticate_user()
-                self.__client = storage.Client(self.project_name)
+                self.__client = self._create_client()
                 return self.__client
             except ModuleNotFoundError:
                 pass
@@ -91,44 +122,133 @@ class GoogleCloudStorage(BlobStorage):
             )
             raise
 
+    def _create_client(self) -> "storage.Client":
+        client = storage.Client(self.project_name)
+        # Requests are made with the client's authorized requests.Session;
+        # its connections are pooled with a larger adapter so that they
+        # are re-used by concurrent requests
+        adapter = HTTPAdapter(
+            pool_connections=_POOL_CONNECTIONS, pool_maxsize=self.max_pool
+        )
+        client._http.mount("https://", adapter)
+        return client
+
+    @property
+    def bucket(self) -> "storage.Bucket":
+        # client.bucket() creates the bucket handle locally, whereas
+        # client.get_bucket() makes a request to fetch its meta-data
+        if self.__bucket is None:
+            self.__bucket = self.client.bucket(self.bucket_name)
+        return self.__bucket
+
     def validate(self) -> bool:
         """Runs any required validation steps - e.g.,
         checking that a cloud bucket exists"""
-        logger.debug("Querying for buckets with prefix=%s...", self.bucket_name)
-        for bucket in list(self.client.list_buckets(prefix=self.bucket_name)):
-            if bucket.name == self.bucket_name:
-                return True
-        return False
+        if not self.__bucket_exists:
+            logger.debug("Querying for buckets with prefix=%s...", self.bucket_name)
+            self.__bucket_exists = any(
+                bucket.name == self.bucket_name
+                for bucket in self.client.list_buckets(prefix=self.bucket_name)
+            )
+        return self.__bucket_exists
 
     def _push(self, source: str, destination: str) -> str:
         logger.info("Uploading to: %s...", destination)
-        bucket = self.client.get_bucket(self.bucket_name)
-        blob = bucket.blob(destination)
+        blob = self.bucket.blob(destination)
+        if TRANSFER_MANAGER_EXISTS and os.path.getsize(source) > self.chunk_size:
+            # Large archives are uploaded as parallel chunks with
+            # the XML multipart upload API
+            transfer_manager.upload_chunks_concurrently(
+                source,
+                blob,
+                chunk_size=self.chunk_size,
+                worker_type=transfer_manager.THREAD,
+                max_workers=self.max_workers,
+            )
+            return destination
 
         ## For slow upload speed
         # https://stackoverflow.com/questions/61001454/why-does-upload-from-file-google-cloud-storage-function-throws-timeout-error
 
         with open(source, "rb") as f:
+            if _is_inline_json(destination, os.path.getsize(source)):
+                _set_inline_json(blob, f.read())
+                f.seek(0)
             blob.upload_from_file(f)
         return destination
 
+    def _push_bytes(self, data: bytes, destination: str) -> str:
+        logger.info("Uploading to: %s...", destination)
+        blob = self.bucket.blob(destination)
+        if _is_inline_json(destination, len(data)):
+            _set_inline_json(blob, data)
+        blob.upload_from_string(data)
+        return destination
+
+    def _copy(self, source: str, destination: str) -> str:
+        """Copies a blob within the bucket, without downloading it"""
+        try:
+            logger.debug("Copying from: %s to: %s...", source, destination)
+            blob = self.bucket.blob(source)
+            self.bucket.copy_blob(blob, self.bucket, destination)
+            return destination
+        except NotFound as e:
+            raise FilePullFailedException(e)
+
     def _pull(self, source: str, destination: str) -> str:
         """Pulls a model to a destination"""
         try:
             logger.debug("Downloading from: %s...", source)
             file_name = os.path.split(source)[1]
             destination = os.path.join(destination, file_name)
-            bucket = self.client.get_bucket(self.bucket_name)
-            blob = bucket.blob(source)
+            blob = self.bucket.blob(source)
+            if TRANSFER_MANAGER_EXISTS:
+                # Downloads the blob with parallel ranged requests
+                transfer_manager.download_chunks_concurrently(
+                    blob,
+                    destination,
+                    chunk_size=self.chunk_size,
+                    worker_type=transfer_manager.THREAD,
+                    max_workers=self.max_workers,
+                )
+                return destination
             blob.download_to_filename(destination)
             return destination
         except NotFound as e:
             raise FilePullFailedException(e)
 
+    def _open(self, source: str) -> BinaryIO:
+        """Opens a blob as a readable, file-like object that
+        downloads the blob in chunks as it is read"""
+        try:
+            blob = self.bucket.blob(source)
+            # A missing blob raises here, instead of when it is first read
+            blob.reload()
+        except NotFound as e:
+            raise FilePullFailedException(e)
+        return blob.open("rb", chunk_size=self.chunk_size)
+
+    def _read_bytes(self, source: str) -> bytes:
+        try:
+            return self.bucket.blob(source).download_as_bytes()
+        except NotFound as e:
+            raise FilePullFailedException(e)
+
+    def _exists(self, path: str) -> bool:
+        """Returns whether a blob exists, using a metadata-only request"""
+        return self.bucket.blob(path).exists()
+
+    def _list_prefix(self, path: str) -> list:
+        blobs = self.client.list_blobs(
+            self.bucket_name,
+            prefix=path + "/",
+            fields="items(name),nextPageToken",
+        )
+        return [blob.name for blob in blobs]
+
     def _remove(self, destination: str) -> bool:
         """Removes a file from the destination path"""
-        bucket = self.client.get_bucket(self.bucket_name)
-        blob = bucket.blob(destination)
+        blob = self.bucket.blob(destination)
         if not blob.exists():
             logger.debug("Remote file does not exist: %s", destination)
             return False
@@ -152,15 +272,20 @@ class GoogleCloudStorage(BlobStorage):
     def _read_json_objects(self, path: str) -> list:
         logger.debug("Listing files in: %s/%s", self.bucket_name, path)
         results = []
+        # The listing's partial response already includes each blob's
+        # meta-data, so it does not need to be re-fetched with a batch of
+        # blob.reload() requests; GCS batches do not support downloads, so
+        # any contents that are not inline are downloaded concurrently
         blobs = self.client.list_blobs(
-            self.bucket_name, prefix=path + "/", delimiter="/"
+            self.bucket_name,
+            prefix=path + "/",
+            delimiter="/",
+            fields="items(name,metadata,updated),nextPageToken",
         )
-        for blob in blobs:
-            if not blob.name.endswith(".json"):
-                continue
-            obj = blob.download_as_string()
+        blobs = [b for b in blobs if b.name.endswith(".json")]
+        for obj in self._map(_read_blob_contents, blobs):
             try:
-                obj = json.loads(obj)
+                obj = serialize.loads(obj)
                 results.append(obj)
             except json.JSONDecodeError:
                 continue
@@ -168,10 +293,30 @@ class GoogleCloudStorage(BlobStorage):
 
     def _read_json_object(self, path: str) -> dict:
         """Returns a dictionary of the JSON stored in a given path"""
-        bucket = self.client.get_bucket(self.bucket_name)
-        blob = bucket.blob(path)
-        obj = blob.download_as_string()
+        blob = self.bucket.blob(path)
+        obj = blob.download_as_bytes()
         try:
-            return json.loads(obj)
+            return serialize.loads(obj)
         except json.JSONDecodeError:
             return None
+
+
+def _is_inline_json(destination: str, size: int) -> bool:
+    return destination.endswith(".json") and size <= _INLINE_JSON_MAX_SIZE
+
+
+def _set_inline_json(blob: "storage.Blob", contents: bytes):
+    # Small JSON files are also stored in the blob's meta-data, so
+    # that listing them returns their contents. Note that this makes
+    # the contents readable by anyone who can list the bucket's objects
+    # (storage.objects.list), even without storage.objects.get
+    blob.metadata = {_INLINE_JSON_KEY: contents.decode("utf-8")}
+
+
+def _read_blob_contents(blob: "storage.Blob") -> Union[str, bytes]:
+    # Returns the contents of a listed blob, using the copy
+    # that is stored in its meta-data if there is one
+    contents = (blob.metadata or {}).get(_INLINE_JSON_KEY)
+    if contents is not None:
+        return contents
+    return blob.download_as_bytes()
@@ -11,23 +11,25 @@
 #    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
+import copy
 import json
 import os
 import shutil
 import warnings
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 from modelstore.storage.blob_storage import BlobStorage
-from modelstore.storage.util.paths import (
-    MODELSTORE_ROOT_PREFIX,
-    get_model_state_path,
-)
-from modelstore.storage.states.model_states import is_valid_state_name
+from modelstore.storage.util.paths import MODELSTORE_ROOT_PREFIX
+from modelstore.storage.util import serialize
 from modelstore.storage.util.versions import sorted_by_created
+from modelstore.utils.cache import TTLCache
 from modelstore.utils.log import logger
 from modelstore.utils.exceptions import FilePullFailedException
 
+_LISTING_CACHE_SIZE = 256
+_LISTING_CACHE_TTL = 5  # seconds
+
 
 class FileSystemStorage(BlobStorage):
 
@@ -56,6 +58,10 @@ class FileSystemStorage(BlobStorage):
             )
         self.root_prefix = os.path.abspath(self.root_prefix)
         self._create_directory=create_directory
+        self._supports_parallel_put = False
+        # Directory listings are cached for a short time, as they are
+        # read repeatedly when listing domains, models and states
+        self._listing_cache = TTLCache(_LISTING_CACHE_SIZE, _LISTING_CACHE_TTL)
 
     def validate(self) -> bool:
         """This validates that the directory exists and can be written to"""
@@ -105,6 +111,23 @@ class FileSystemStorage(BlobStorage):
     def _push(self, source: str, destination: str) -> str:
         destination = self.relative_dir(destination)
         shutil.copy(source, destination)
+        self._listing_cache.pop(os.path.dirname(destination))
+        return destination
+
+    def _push_bytes(self, data: bytes, destination: str) -> str:
+        destination = self.relative_dir(destination)
+        with open(destination, "wb") as out:
+            out.write(data)
+        self._listing_cache.pop(os.path.dirname(destination))
+        return destination
+
+    def _copy(self, source: str, destination: str) -> str:
+        source = os.path.join(self.root_prefix, source)
+        if not os.path.isfile(source):
+            raise FilePullFailedException(f"File {source} does not exist.")
+        destination = self.relative_dir(destination)
+        shutil.copyfile(source, destination)
+        self._listing_cache.pop(os.path.dirname(destination))
         return destination
 
     def _pull(self, source: str, destination: str) -> str:
@@ -118,6 +141,38 @@ class FileSystemStorage(BlobStorage):
         except FileNotFoundError as e:
             raise FilePullFailedException(e)
 
+    def _open(self, source: str) -> BinaryIO:
+        """Opens the stored file directly, so that it can be read in
+        place instead of being copied out of the root directory first"""
+        try:
+            stream = open(source, "rb")
+        except FileNotFoundError as e:
+            raise FilePullFailedException(e)
+        if hasattr(os, "posix_fadvise"):
+            # Archives are read from start to end, so ask the OS
+            # to read ahead more aggressively
+            os.posix_fadvise(stream.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        return stream
+
+    def _read_bytes(self, source: str) -> bytes:
+        try:
+            with open(os.path.join(self.root_prefix, source), "rb") as lines:
+                return lines.read()
+        except FileNotFoundError as e:
+            raise FilePullFailedException(e)
+
+    def _exists(self, path: str) -> bool:
+        # Unlike relative_dir(), this does not create any directories
+        return os.path.isfile(os.path.join(self.root_prefix, path))
+
+    def _list_prefix(self, path: str) -> list:
+        # Unlike relative_dir(), this does not create any directories
+        path = os.path.join(self.root_prefix, path)
+        paths = []
+        for dir_path, _, file_names in os.walk(path):
+            paths.extend(os.path.join(dir_path, x) for x in file_names)
+        return paths
+
     def _remove(self, destination: str) -> bool:
         """Removes a file from the destination path"""
         # @TODO: Empty directories are left behind after the destination file
@@ -126,22 +181,29 @@ class FileSystemStorage(BlobStorage):
         if not os.path.exists(destination):
             logger.debug("Remote file does not exist: %s", destination)
             return False
-        os.remove(destination)        
+        os.remove(destination)
+        self._listing_cache.pop(os.path.dirname(destination))
         return True
 
     def _read_json_objects(self, path: str) -> list:
         path = self.relative_dir(path)
-        if not os.path.exists(path):
-            return []
-        results = []
-        for entry in os.listdir(path):
-            if not entry.endswith(".json"):
-                continue
-            version_path = os.path.join(path, entry)
-            body = _read_json_file(version_path)
-            if body is not None:
-                results.append(body)
-        return sorted_by_created(results)
+        results = self._listing_cache.get(path)
+        if results is None:
+            if not os.path.exists(path):
+                return []
+            results = []
+            # scandir() returns each entry's type along with its name,
+            # so this does not need a stat() call per entry
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    body = _read_json_file(entry.path)
+                    if body is not None:
+                        results.append(body)
+            results = sorted_by_created(results)
+            self._listing_cache.set(path, results)
+        return copy.deepcopy(results)
 
     def relative_dir(self, file_path: str) -> str:
         paths = os.path.split(file_path)
@@ -165,21 +227,10 @@ class FileSystemStorage(BlobStorage):
         path = self.relative_dir(path)
         return _read_json_file(path)
 
-    def state_exists(self, state_name: str) -> bool:
-        """Returns whether a model state with name state_name exists"""
-        if not is_valid_state_name(state_name):
-            return False
-        # @TODO this function can be removed once get_model_state_path
-        # doesn't need to be called with relative_dir()
-        state_path = self.relative_dir(
-            get_model_state_path(self.root_prefix, state_name)
-        )
-        return os.path.exists(state_path)
-
 
 def _read_json_file(path: str) -> dict:
     try:
-        with open(path, "r") as lines:
-            return json.loads(lines.read())
+        with open(path, "rb") as lines:
+            return serialize.loads(lines.read())
     except json.JSONDecodeError:
         return None
@@ -12,7 +12,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 from abc import ABC, ABCMeta, abstractmethod
-from typing import Optional, Union
+from typing import BinaryIO, Optional, Union
 
 from modelstore.meta.dependencies import module_exists
 
@@ -59,6 +59,12 @@ class CloudStorage(ABC):
         """Returns a model's meta data"""
         raise NotImplementedError()
 
+    @abstractmethod
+    def exists(self, domain: str, model_id: str) -> bool:
+        """Returns whether a model's meta data exists, without
+        downloading it"""
+        raise NotImplementedError()
+
     @abstractmethod
     def download(self, local_path: str, domain: str, model_id: str = None):
         """Downloads an artifacts archive for a given (domain, model_id) pair.
@@ -66,6 +72,13 @@ class CloudStorage(ABC):
         domain"""
         raise NotImplementedError()
 
+    @abstractmethod
+    def download_stream(self, domain: str, model_id: str = None) -> BinaryIO:
+        """Returns a readable, file-like object of the artifacts archive
+        for a given (domain, model_id) pair. If no model_id is given, it
+        defaults to the latest model in that domain"""
+        raise NotImplementedError()
+
     @abstractmethod
     def delete_model(
         self, domain: str, model_id: str, meta_data: dict, skip_prompt: bool = False
@@ -79,7 +92,9 @@ class CloudStorage(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    def list_models(self, domain: str, state_name: Optional[str] = None) -> list:
+    def list_models(
+        self, domain: str, state_name: Optional[str] = None, verify: bool = False
+    ) -> list:
         """Returns a list of a model's versions"""
         raise NotImplementedError()
 
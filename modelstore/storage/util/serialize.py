@@ -0,0 +1,69 @@
+#    Copyright 2022 Neal Lathia
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+import json
+import math
+from typing import Union
+
+try:
+    import orjson
+
+    ORJSON_EXISTS = True
+except ImportError:
+    ORJSON_EXISTS = False
+
+
+def loads(obj: Union[bytes, str]):
+    """Deserializes a JSON document; this uses orjson, if it is
+    installed, as it is faster than the standard library.
+
+    Both libraries raise a json.JSONDecodeError on invalid input.
+    orjson also rejects the NaN and Infinity values that the standard
+    library writes, so those documents are loaded with the standard library.
+    """
+    if ORJSON_EXISTS:
+        try:
+            return orjson.loads(obj)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(obj)
+
+
+def dumps(obj) -> bytes:
+    """Serializes an object into a UTF-8 encoded JSON document; this
+    uses orjson, if it is installed, and falls back to the standard library
+    for any values that orjson does not support (e.g., integers that
+    are larger than 64 bits).
+
+    orjson writes NaN and Infinity as null, so documents that contain them
+    are also written with the standard library, which keeps those values.
+    """
+    if ORJSON_EXISTS:
+        try:
+            result = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+            # A non-finite float can only have been written as null
+            if b"null" not in result or not _has_non_finite_floats(obj):
+                return result
+        except TypeError:
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def _has_non_finite_floats(obj) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite_floats(x) for x in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite_floats(x) for x in obj)
+    return False
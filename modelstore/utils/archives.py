@@ -0,0 +1,224 @@
+#    Copyright 2022 Neal Lathia
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+import gzip
+import os
+import tarfile
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+from modelstore.utils.log import logger
+
+try:
+    # python-isal provides a gzip implementation that is accelerated with
+    # Intel's ISA-L library; it is used instead of the standard library's
+    # zlib-based gzip if it is installed
+    from isal import igzip, isal_zlib
+
+    ISAL_EXISTS = True
+except ImportError:
+    ISAL_EXISTS = False
+
+_BUFFER_SIZE = 2 * 1024 * 1024  # 2 MB
+
+# Files are read out of the archive sequentially and written to disk by a
+# pool of threads; this caps how much data is held in memory while waiting
+# to be written
+_MAX_WORKERS = 4
+_MAX_PENDING_BYTES = 64 * 1024 * 1024  # 64 MB
+
+# Small files are handed to the thread pool in batches, rather than one task
+# per file, to reduce the overhead of submitting many tiny writes
+_WRITE_BATCH_SIZE = 16
+
+# Python 3.12 (and security releases back to 3.8) added extraction filters;
+# the "data" filter rejects links outside of the target directory and
+# removes unsafe permission bits, without any further per-member checks
+_DATA_FILTER = getattr(tarfile, "data_filter", None)
+_EXTRACT_KWARGS = {"filter": "data"} if _DATA_FILTER is not None else {}
+
+# Setting a file's attributes via its open file descriptor avoids
+# looking up its path again (not supported on Windows)
+_SET_ATTRIBUTES_WITH_FD = os.chmod in os.supports_fd and os.utime in os.supports_fd
+
+
+@contextmanager
+def create_archive(archive_path: str) -> Iterator[tarfile.TarFile]:
+    """Creates a .tar.gz archive at archive_path and yields a
+    tarfile that files can be added to"""
+    # tarfile's "w:gz" mode compresses into a file that has the default
+    # (8 KB) buffer; this compresses into a file with a large buffer instead
+    with open(archive_path, "wb", buffering=_BUFFER_SIZE) as raw_file:
+        with _gzip_file(raw_file, "wb") as gz_file:
+            with tarfile.open(fileobj=gz_file, mode="w") as tar:
+                yield tar
+
+
+def extract_archive(archive: BinaryIO, local_path: str):
+    """Extracts a .tar.gz archive into local_path. The archive is
+    read as a stream, so it does not need to be seekable"""
+    local_path = os.path.realpath(local_path)
+    executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+    with executor, _gzip_file(archive, "rb") as gz_file:
+        with tarfile.open(fileobj=gz_file, mode="r|", bufsize=_BUFFER_SIZE) as tar:
+            # Copy the archive's large files out with large reads & writes,
+            # instead of tarfile's default 16 KB buffer
+            tar.copybufsize = _BUFFER_SIZE
+            writer = _BatchWriter(executor)
+            directories = []
+            for member in tar:
+                if not member.isfile() or member.size > _MAX_PENDING_BYTES:
+                    # Directories, links and large files are extracted in
+                    # this thread, as tarfile would; links may point to files
+                    # that are still pending, so those are written first
+                    writer.drain()
+                    if member.isdir():
+                        directories.append(_extract_directory(tar, member, local_path))
+                    else:
+                        tar.extract(member, local_path, **_EXTRACT_KWARGS)
+                    continue
+                target = _get_target_path(local_path, member.name)
+                if _DATA_FILTER is not None:
+                    member = _DATA_FILTER(member, local_path)
+                # Pending files are written before this one is read into
+                # memory, so that no more than _MAX_PENDING_BYTES are held
+                writer.make_room(target, member.size)
+                writer.add(target, tar.extractfile(member).read(), member)
+            writer.drain()
+
+            # As in tarfile's extractall(), the directories' attributes are set
+            # after their contents have been extracted, since read-only
+            # directories can't be written to and writing resets their mtime
+            directories.sort(key=lambda x: x.name, reverse=True)
+            for member in directories:
+                _set_directory_attributes(tar, member, local_path)
+
+
+class _BatchWriter:
+
+    """
+    Writes files with a pool of threads, in batches; a file that has the
+    same path as one that is pending is only written after it, so that
+    the last member in the archive wins (as with tarfile)
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor):
+        self.executor = executor
+        self.pending = []
+        self.pending_bytes = 0
+        self.pending_targets = set()
+        self.batch = []
+
+    def make_room(self, target: str, size: int):
+        """Waits for the pending files to be written if a file with
+        this target and size can't be added to them"""
+        if (
+            target in self.pending_targets
+            or self.pending_bytes + size > _MAX_PENDING_BYTES
+        ):
+            self.drain()
+
+    def add(self, target: str, contents: bytes, member: tarfile.TarInfo):
+        self.batch.append((target, contents, member))
+        self.pending_bytes += member.size
+        self.pending_targets.add(target)
+        if len(self.batch) == _WRITE_BATCH_SIZE:
+            self._submit()
+
+    def drain(self):
+        """Waits for all of the pending files to be written"""
+        self._submit()
+        for future in wait(self.pending).done:
+            # Raises any exception that happened while writing a file
+            future.result()
+        self.pending = []
+        self.pending_bytes = 0
+        self.pending_targets = set()
+
+    def _submit(self):
+        if len(self.batch) != 0:
+            self.pending.append(self.executor.submit(_write_all, self.batch))
+            self.batch = []
+
+
+def _extract_directory(
+    tar: tarfile.TarFile, member: tarfile.TarInfo, local_path: str
+) -> tarfile.TarInfo:
+    if _DATA_FILTER is not None:
+        member = _DATA_FILTER(member, local_path)
+    tar.extract(member, local_path, set_attrs=False, **_EXTRACT_KWARGS)
+    return member
+
+
+def _set_directory_attributes(
+    tar: tarfile.TarFile, member: tarfile.TarInfo, local_path: str
+):
+    directory_path = os.path.join(local_path, member.name)
+    try:
+        tar.chown(member, directory_path, numeric_owner=False)
+        tar.utime(member, directory_path)
+        tar.chmod(member, directory_path)
+    except tarfile.ExtractError as e:
+        # This is not a fatal error in tarfile's extractall() either
+        logger.debug("Failed to set attributes of %s: %s", directory_path, e)
+
+
+def _get_target_path(local_path: str, name: str) -> str:
+    target = os.path.realpath(os.path.join(local_path, name))
+    if os.path.commonpath([local_path, target]) != local_path:
+        raise tarfile.ExtractError(
+            f"{name} would be extracted outside of {local_path}"
+        )
+    return target
+
+
+def _write_all(batch: list):
+    for target, contents, member in batch:
+        _write(target, contents, member)
+
+
+def _write(target: str, contents: bytes, member: tarfile.TarInfo):
+    """Writes a file with a single file descriptor; the file's mode and
+    modification time are also set through it where the OS supports it"""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(target, flags, 0o600)
+    try:
+        view = memoryview(contents)
+        while view:
+            view = view[os.write(fd, view) :]
+        if _SET_ATTRIBUTES_WITH_FD:
+            _set_attributes(fd, member)
+    finally:
+        os.close(fd)
+    if not _SET_ATTRIBUTES_WITH_FD:
+        _set_attributes(target, member)
+
+
+def _set_attributes(path, member: tarfile.TarInfo):
+    os.chmod(path, member.mode)
+    os.utime(path, (member.mtime, member.mtime))
+
+
+def _gzip_file(fileobj: BinaryIO, mode: str) -> gzip.GzipFile:
+    # Archives are written with each library's best compression level; this
+    # is the standard library's default (and what tarfile's "w:gz" uses), but
+    # ISA-L defaults to a faster level that creates larger archives
+    if ISAL_EXISTS:
+        return igzip.IGzipFile(
+            fileobj=fileobj,
+            mode=mode,
+            compresslevel=isal_zlib.ISAL_BEST_COMPRESSION,
+        )
+    return gzip.GzipFile(fileobj=fileobj, mode=mode, compresslevel=9)
@@ -0,0 +1,81 @@
+#    Copyright 2022 Neal Lathia
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+
+    """
+    A thread-safe, in-memory cache that holds up to max_size entries;
+    the least recently used entry is evicted when it is full, and
+    entries expire ttl seconds after they were set (if ttl is not None)
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the value for key, or default if it is
+        not in the cache or has expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Adds a value to the cache; ttl overrides the
+        cache's default time to live for this entry. Values
+        with a ttl of zero (or less) are not cached"""
+        ttl = ttl if ttl is not None else self.ttl
+        if ttl is not None and ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """Removes key from the cache, if it exists"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Removes all of the entries in the cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> dict:
+        # Locks can't be pickled; the cached entries are also dropped, so
+        # that a pickled cache is empty (and fresh) when it is unpickled
+        return {"max_size": self.max_size, "ttl": self.ttl}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["max_size"], state["ttl"])
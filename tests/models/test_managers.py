@@ -27,3 +27,11 @@ def test_iter_libraries():
     assert isinstance(mgrs["xgboost"], XGBoostManager)
     assert isinstance(mgrs["catboost"], CatBoostManager)
     assert isinstance(mgrs["pytorch_lightning"], PyTorchLightningManager)
+
+
+def test_available_library_classes_is_cached():
+    managers._available_library_classes.cache_clear()
+    available = managers._available_library_classes()
+    assert "sklearn" in available
+    assert managers._available_library_classes() is available
+    assert managers._available_library_classes.cache_info().hits == 1
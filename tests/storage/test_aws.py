@@ -17,6 +17,7 @@ import os
 import boto3
 import pytest
 from modelstore.storage.aws import AWSStorage
+from modelstore.utils.exceptions import FilePullFailedException
 from moto import mock_s3
 
 # pylint: disable=unused-import
@@ -86,6 +87,36 @@ def test_validate(bucket_name, validate_should_pass):
     assert storage.validate() == validate_should_pass
 
 
+def test_transfer_config():
+    storage = AWSStorage(bucket_name=_MOCK_BUCKET_NAME)
+    assert storage.transfer_config.use_threads
+    assert storage.transfer_config.max_concurrency > 1
+    assert storage.transfer_config is storage.transfer_config
+
+
+@pytest.mark.parametrize("max_pool,expected", [(None, 64), (8, 8)])
+def test_client_connection_pool(max_pool, expected):
+    storage = AWSStorage(bucket_name=_MOCK_BUCKET_NAME, max_pool=max_pool)
+    assert storage.client.meta.config.max_pool_connections == expected
+
+
+def test_push_bytes():
+    storage = AWSStorage(bucket_name=_MOCK_BUCKET_NAME)
+    result = storage._push_bytes(b"contents", remote_file_path())
+    assert result == remote_file_path()
+    assert storage._exists(remote_file_path())
+
+
+def test_copy():
+    storage = AWSStorage(bucket_name=_MOCK_BUCKET_NAME)
+    storage._push_bytes(b"contents", remote_file_path())
+    destination = remote_path() + "/copied-file.txt"
+    assert storage._copy(remote_file_path(), destination) == destination
+    assert storage._exists(destination)
+    with pytest.raises(FilePullFailedException):
+        storage._copy(remote_path() + "/missing-file.txt", destination)
+
+
 def test_push(tmp_path, moto_boto):
     # Push a file to storage
     storage = AWSStorage(bucket_name=_MOCK_BUCKET_NAME)
@@ -117,6 +148,35 @@ def test_pull(tmp_path):
     assert file_contains_expected_contents(local_destination)
 
 
+def test_open():
+    storage = AWSStorage(bucket_name=_MOCK_BUCKET_NAME)
+    storage._push_bytes(b"contents", remote_file_path())
+    stream = storage._open(remote_file_path())
+    assert hasattr(stream, "read")
+    stream.close()
+
+
+def test_open_missing_file():
+    storage = AWSStorage(bucket_name=_MOCK_BUCKET_NAME)
+    with pytest.raises(FilePullFailedException):
+        storage._open(remote_path() + "/missing-file.txt")
+
+
+def test_read_bytes_missing_file():
+    storage = AWSStorage(bucket_name=_MOCK_BUCKET_NAME)
+    with pytest.raises(FilePullFailedException):
+        storage._read_bytes(remote_path() + "/missing-file.txt")
+
+
+@pytest.mark.parametrize("file_exists", [False, True])
+def test_exists(tmp_path, file_exists):
+    storage = AWSStorage(bucket_name=_MOCK_BUCKET_NAME)
+    remote_destination = remote_file_path()
+    if file_exists:
+        storage._push(temp_file(tmp_path), remote_destination)
+    assert storage._exists(remote_destination) == file_exists
+
+
 @pytest.mark.parametrize(
     "file_exists,should_call_delete",
     [
@@ -144,6 +204,19 @@ def test_remove(tmp_path, file_exists, should_call_delete):
         pytest.fail("Remove raised an exception")
 
 
+def test_list_prefix(tmp_path):
+    storage = AWSStorage(bucket_name=_MOCK_BUCKET_NAME)
+    prefix = remote_path()
+    expected = [
+        os.path.join(prefix, "file.txt"),
+        os.path.join(prefix, "sub-prefix", "file.json"),
+    ]
+    for remote_destination in expected:
+        storage._push(temp_file(tmp_path), remote_destination)
+    storage._push(temp_file(tmp_path), "other-prefix/file.txt")
+    assert sorted(storage._list_prefix(prefix)) == expected
+
+
 def test_read_json_objects_ignores_non_json(tmp_path):
     storage = AWSStorage(bucket_name=_MOCK_BUCKET_NAME)
     prefix = remote_path()
@@ -16,6 +16,7 @@ import os
 from unittest import mock
 
 import pytest
+from azure.core.exceptions import ResourceNotFoundError
 from azure.storage.blob import (
     BlobClient,
     BlobProperties,
@@ -24,6 +25,7 @@ from azure.storage.blob import (
     StorageStreamDownloader,
 )
 from modelstore.storage.azure import AzureBlobStorage
+from modelstore.utils.exceptions import FilePullFailedException
 
 # pylint: disable=unused-import
 from tests.storage.test_utils import (
@@ -58,6 +60,9 @@ def mock_blob_client(file_exists: bool):
     if file_exists:
         blob_stream = mock.create_autospec(StorageStreamDownloader)
         blob_stream.readall.return_value = str.encode(TEST_FILE_CONTENTS)
+        blob_stream.readinto.side_effect = lambda stream: stream.write(
+            str.encode(TEST_FILE_CONTENTS)
+        )
         blob_client.download_blob.return_value = blob_stream
     return blob_client
 
@@ -102,6 +107,22 @@ def test_create_from_environment_variables(monkeypatch):
         pytest.fail("Failed to initialise storage from env variables")
 
 
+def test_client_connection_pool(monkeypatch):
+    connection_string = ";".join(
+        [
+            "DefaultEndpointsProtocol=https",
+            "AccountName=account",
+            "AccountKey=a2V5",
+            "EndpointSuffix=core.windows.net",
+        ]
+    )
+    monkeypatch.setenv("AZURE_STORAGE_CONNECTION_STRING", connection_string)
+    storage = AzureBlobStorage(container_name=_MOCK_CONTAINER_NAME, max_pool=8)
+    session = storage.client._pipeline._transport.session
+    adapter = session.get_adapter("https://account.blob.core.windows.net")
+    assert adapter._pool_maxsize == 8
+
+
 def test_create_fails_with_missing_environment_variables(monkeypatch):
     # Fails when environment variables are missing
     for key in AzureBlobStorage.BUILD_FROM_ENVIRONMENT.get("required", []):
@@ -149,6 +170,48 @@ def test_push(tmp_path):
     blob_client.upload_blob.assert_called()
 
 
+def test_push_bytes():
+    blob_service_client = mock_blob_service_client(
+        container_exists=True,
+        files_exist=False,
+    )
+    storage = azure_storage(blob_service_client)
+    prefix = remote_file_path()
+    assert storage._push_bytes(b"contents", prefix) == prefix
+
+    blob_client = storage._blob_client(prefix)
+    blob_client.upload_blob.assert_called_once_with(b"contents", overwrite=True)
+
+
+@pytest.mark.parametrize("final_status", ["success", "failed"])
+def test_copy(final_status):
+    blob_client = mock_blob_service_client(container_exists=True, files_exist=True)
+    storage = azure_storage(blob_client)
+    mock_blob = storage._container_client().get_blob_client(remote_file_path())
+    mock_blob.url = "https://account.blob.core.windows.net/a/b"
+    mock_blob.start_copy_from_url.return_value = {"copy_status": "pending"}
+    mock_blob.get_blob_properties.return_value.copy.status = final_status
+    destination = os.path.join(remote_path(), "copied-file.txt")
+    with mock.patch("modelstore.storage.azure.time.sleep") as mock_sleep:
+        assert storage._copy(remote_file_path(), destination) == destination
+        mock_sleep.assert_called_once()
+
+    # The copy is not synchronous, so it does not need the source
+    # url to be publicly readable or signed
+    mock_blob.start_copy_from_url.assert_called_once_with(mock_blob.url)
+    if final_status == "success":
+        mock_blob.upload_blob.assert_not_called()
+    else:
+        # Failed copies fall back to downloading and uploading the blob
+        mock_blob.upload_blob.assert_called_once_with(
+            str.encode(TEST_FILE_CONTENTS), overwrite=True
+        )
+
+    mock_blob.start_copy_from_url.side_effect = ResourceNotFoundError()
+    with pytest.raises(FilePullFailedException):
+        storage._copy(remote_file_path(), destination)
+
+
 def test_pull(tmp_path):
     # Create a mock storage instance
     blob_service_client = mock_blob_service_client(
@@ -168,6 +231,52 @@ def test_pull(tmp_path):
     assert file_contains_expected_contents(result)
 
 
+def test_open():
+    # Create a mock storage instance
+    blob_service_client = mock_blob_service_client(
+        container_exists=True,
+        files_exist=True,
+    )
+    storage = azure_storage(blob_service_client)
+    blob_stream = storage._blob_client(remote_file_path()).download_blob()
+    blob_stream.chunks.return_value = iter([b'{"k": ', b'"v"}'])
+
+    # Asserts that the chunks of the blob are read back as a stream
+    with storage._open(remote_file_path()) as stream:
+        assert stream.read(2) == b'{"'
+        assert stream.read() == b'k": "v"}'
+        assert stream.read() == b""
+
+
+def test_read_bytes():
+    blob_service_client = mock_blob_service_client(
+        container_exists=True,
+        files_exist=True,
+    )
+    storage = azure_storage(blob_service_client)
+    assert storage._read_bytes(remote_file_path()) == TEST_FILE_CONTENTS.encode()
+
+    blob_client = storage._blob_client(remote_file_path())
+    blob_client.download_blob.side_effect = ResourceNotFoundError("missing")
+    with pytest.raises(FilePullFailedException):
+        storage._read_bytes(remote_file_path())
+
+
+@pytest.mark.parametrize("file_exists", [False, True])
+def test_exists(file_exists):
+    # Create a mock storage instance
+    blob_service_client = mock_blob_service_client(
+        container_exists=True,
+        files_exist=file_exists,
+    )
+    storage = azure_storage(blob_service_client)
+    assert storage._exists(remote_file_path()) == file_exists
+
+    # Asserts that the file was not downloaded
+    blob_client = storage._blob_client(remote_file_path())
+    blob_client.download_blob.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "file_exists,should_call_delete",
     [
@@ -205,6 +314,20 @@ def test_remove(file_exists, should_call_delete):
         pytest.fail("Remove raised an exception")
 
 
+def test_list_prefix():
+    blob_service_client = mock_blob_service_client(
+        container_exists=True,
+        files_exist=True,
+    )
+    storage = azure_storage(blob_service_client)
+    prefix = remote_path()
+    result = storage._list_prefix(prefix)
+    storage._container_client().list_blobs.assert_called_with(
+        name_starts_with=prefix + "/"
+    )
+    assert result == [os.path.join(prefix, x) for x in TEST_FILE_LIST]
+
+
 def test_read_json_objects():
     # Create a mock storage instance
     blob_service_client = mock_blob_service_client(
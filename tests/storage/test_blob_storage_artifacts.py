@@ -13,14 +13,17 @@
 #    limitations under the License.
 import os
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from modelstore.meta import metadata
 from modelstore.storage.local import FileSystemStorage
 from modelstore.storage.util.paths import (
+    MODELSTORE_ROOT_PREFIX,
     get_archive_path,
 )
 from modelstore.utils.exceptions import (
+    DomainNotFoundException,
     ModelDeletedException,
 )
 
@@ -60,6 +63,65 @@ def test_download():
     pass
 
 
+def test_download_stream(mock_blob_storage, mock_model_file):
+    domain = "test-domain"
+    model_id = "test-model-id"
+    with open(mock_model_file, "w") as out:
+        out.write("model-contents")
+    storage_meta = mock_blob_storage.upload(domain, mock_model_file)
+    meta_data = metadata.generate(
+        model_meta={"model_id": model_id},
+        storage_meta=storage_meta,
+        code_meta={},
+    )
+    mock_blob_storage.set_meta_data(domain, model_id, meta_data)
+
+    # Stream a specific model and the latest model
+    for stream_model_id in [model_id, None]:
+        with mock_blob_storage.download_stream(domain, stream_model_id) as stream:
+            assert stream.read() == b"model-contents"
+
+
+def test_download_latest_reads_meta_data_once(mock_blob_storage, mock_model_file):
+    domain = "test-domain"
+    storage_meta = mock_blob_storage.upload(domain, mock_model_file)
+    meta_data = metadata.generate(
+        model_meta={"model_id": "test-model-id"},
+        storage_meta=storage_meta,
+        code_meta={},
+    )
+    mock_blob_storage.set_meta_data(domain, "test-model-id", meta_data)
+
+    with patch.object(mock_blob_storage, "get_meta_data") as mock_get_meta_data:
+        with mock_blob_storage.download_stream(domain) as stream:
+            assert stream.read() == b""
+        mock_get_meta_data.assert_not_called()
+
+
+def test_download_latest_uses_cached_meta_data(
+    tmp_path, mock_blob_storage, mock_model_file
+):
+    domain = "test-domain"
+    storage_meta = mock_blob_storage.upload(domain, mock_model_file)
+    meta_data = metadata.generate(
+        model_meta={"model_id": "test-model-id"},
+        storage_meta=storage_meta,
+        code_meta={},
+    )
+    mock_blob_storage.set_meta_data(domain, "test-model-id", meta_data)
+
+    with patch.object(mock_blob_storage, "_read_bytes") as mock_read_bytes:
+        with patch.object(mock_blob_storage, "_read_json_object") as mock_read_json:
+            mock_blob_storage.download(str(tmp_path), domain)
+            mock_read_bytes.assert_not_called()
+            mock_read_json.assert_not_called()
+
+
+def test_download_latest_missing_domain(tmp_path, mock_blob_storage):
+    with pytest.raises(DomainNotFoundException):
+        mock_blob_storage.download(str(tmp_path), "missing-domain")
+
+
 def test_delete_model(mock_blob_storage, mock_model_file):
     # Setup:
     # - Upload a model
@@ -103,3 +165,59 @@ def test_delete_model(mock_blob_storage, mock_model_file):
 
     model_ids = mock_blob_storage.list_models(domain, model_state)
     assert model_id not in model_ids
+
+
+def test_delete_model_only_removes_existing_states(mock_blob_storage, mock_model_file):
+    domain = "test-domain"
+    model_id = "test-model-id"
+    storage_meta = mock_blob_storage.upload(domain, mock_model_file)
+    meta_data = metadata.generate(
+        model_meta={"model_id": model_id},
+        storage_meta=storage_meta,
+        code_meta={},
+    )
+    mock_blob_storage.set_meta_data(domain, model_id, meta_data)
+    for model_state in ["state-1", "state-2", "state-3"]:
+        mock_blob_storage.create_model_state(model_state)
+    mock_blob_storage.set_model_state(domain, model_id, "state-2")
+
+    with patch.object(
+        mock_blob_storage, "_remove", wraps=mock_blob_storage._remove
+    ) as mock_remove:
+        mock_blob_storage.delete_model(domain, model_id, meta_data, skip_prompt=True)
+        # The archive, the model's meta-data, and the one state it was in
+        assert mock_remove.call_count == 3
+
+    for model_state in ["state-1", "state-2", "state-3"]:
+        assert model_id not in mock_blob_storage.list_models(domain, model_state)
+    with pytest.raises(ModelDeletedException):
+        mock_blob_storage.get_meta_data(domain, model_id)
+
+
+def test_get_deleted_model_does_not_pull(mock_blob_storage, mock_model_file):
+    domain = "test-domain"
+    model_id = "test-model-id"
+    storage_meta = mock_blob_storage.upload(domain, mock_model_file)
+    meta_data = metadata.generate(
+        model_meta={"model_id": model_id},
+        storage_meta=storage_meta,
+        code_meta={},
+    )
+    mock_blob_storage.set_meta_data(domain, model_id, meta_data)
+    mock_blob_storage.delete_model(domain, model_id, meta_data, skip_prompt=True)
+
+    with patch.object(mock_blob_storage, "_read_bytes") as mock_read_bytes:
+        with pytest.raises(ModelDeletedException):
+            mock_blob_storage.get_meta_data(domain, model_id)
+        mock_read_bytes.assert_not_called()
+
+    # Setting the model's meta-data again removes its tombstone
+    mock_blob_storage.set_meta_data(domain, model_id, meta_data)
+    assert mock_blob_storage.get_meta_data(domain, model_id) == meta_data
+
+
+def test_archive_root_follows_root_prefix(mock_blob_storage):
+    mock_blob_storage.root_prefix = "new-root"
+    assert mock_blob_storage._archive_root == os.path.join(
+        "new-root", MODELSTORE_ROOT_PREFIX
+    )
@@ -16,6 +16,7 @@ import os
 from datetime import datetime, timedelta
 from pathlib import Path
 import uuid
+from unittest.mock import patch
 
 import modelstore
 import pytest
@@ -25,6 +26,10 @@ from modelstore.storage.util.paths import (
     get_domain_path,
     get_models_path,
 )
+from modelstore.utils.exceptions import (
+    DomainNotFoundException,
+    ModelNotFoundException,
+)
 
 
 def mock_meta_data(domain: str, model_id: str, inc_time: int):
@@ -53,8 +58,8 @@ def mock_blob_storage(tmp_path):
 
 def assert_file_contents_equals(file_path: str, expected: dict):
     with open(file_path, "r") as lines:
-        actual = lines.read()
-    assert json.dumps(expected) == actual
+        actual = json.load(lines)
+    assert expected == actual
 
 
 def test_list_domains(mock_blob_storage):
@@ -89,6 +94,27 @@ def test_list_models(mock_blob_storage):
     assert models[1] == "model-1"
 
 
+@pytest.mark.parametrize("verify", [False, True])
+def test_list_models_missing_domain(mock_blob_storage, verify):
+    with pytest.raises(DomainNotFoundException):
+        mock_blob_storage.list_models("domain-1", verify=verify)
+
+
+def test_list_models_does_not_pull_domain(mock_blob_storage):
+    meta_data = mock_meta_data("domain-1", "model-1", inc_time=0)
+    mock_blob_storage.set_meta_data("domain-1", "model-1", meta_data)
+    domain_path = get_domain_path(mock_blob_storage.root_prefix, "domain-1")
+    mock_blob_storage._meta_cache.pop(domain_path)
+
+    with patch.object(
+        mock_blob_storage, "_read_bytes", wraps=mock_blob_storage._read_bytes
+    ) as mock_read_bytes:
+        assert mock_blob_storage.list_models("domain-1") == ["model-1"]
+        mock_read_bytes.assert_not_called()
+        assert mock_blob_storage.list_models("domain-1", verify=True) == ["model-1"]
+        mock_read_bytes.assert_called_once()
+
+
 def test_get_metadata_path(mock_blob_storage):
     exp = os.path.join(
         mock_blob_storage.root_prefix,
@@ -101,6 +127,15 @@ def test_get_metadata_path(mock_blob_storage):
     assert exp == res
 
 
+def test_get_metadata_path_is_memoized(mock_blob_storage):
+    target = "modelstore.storage.blob_storage.get_models_path"
+    with patch(target, wraps=get_models_path) as mock_get_models_path:
+        for model_id in ["model-1", "model-2"]:
+            mock_blob_storage._get_metadata_path("domain", model_id)
+            mock_blob_storage._get_metadata_path("domain", model_id, "prod")
+        assert mock_get_models_path.call_count == 2
+
+
 def test_set_meta_data(mock_blob_storage):
     # Set the meta data of a fake model
     meta_data = mock_meta_data("domain-1", "model-1", inc_time=0)
@@ -119,6 +154,20 @@ def test_set_meta_data(mock_blob_storage):
     assert_file_contents_equals(model_meta_data_path, meta_data)
 
 
+@pytest.mark.parametrize("parallel_put", [False, True])
+def test_set_meta_data_pushes_in_parallel(mock_blob_storage, parallel_put):
+    mock_blob_storage._supports_parallel_put = parallel_put
+    meta_data = mock_meta_data("domain-1", "model-1", inc_time=0)
+    with patch.object(
+        mock_blob_storage, "_map", wraps=mock_blob_storage._map
+    ) as mock_map:
+        mock_blob_storage.set_meta_data("domain-1", "model-1", meta_data)
+        assert mock_map.called == parallel_put
+
+    assert mock_blob_storage.get_meta_data("domain-1", "model-1") == meta_data
+    assert mock_blob_storage.get_domain("domain-1") == meta_data
+
+
 def test_get_meta_data(mock_blob_storage):
     # Set the meta data of a fake model
     meta_data = mock_meta_data("domain-1", "model-1", inc_time=0)
@@ -128,6 +177,91 @@ def test_get_meta_data(mock_blob_storage):
     assert mock_blob_storage.get_meta_data("domain-1", "model-1") == meta_data
 
 
+def test_get_meta_data_is_cached(mock_blob_storage):
+    meta_data = mock_meta_data("domain-1", "model-1", inc_time=0)
+    mock_blob_storage.set_meta_data("domain-1", "model-1", meta_data)
+    mock_blob_storage._meta_cache.pop(
+        mock_blob_storage._get_metadata_path("domain-1", "model-1")
+    )
+
+    with patch.object(
+        mock_blob_storage, "_read_bytes", wraps=mock_blob_storage._read_bytes
+    ) as mock_read_bytes:
+        assert mock_blob_storage.get_meta_data("domain-1", "model-1") == meta_data
+        assert mock_blob_storage.get_meta_data("domain-1", "model-1") == meta_data
+        mock_read_bytes.assert_called_once()
+
+        # Callers receive a copy of the cached meta-data
+        mock_blob_storage.get_meta_data("domain-1", "model-1")["model"] = None
+        assert mock_blob_storage.get_meta_data("domain-1", "model-1") == meta_data
+
+        # Setting the meta-data updates the cache
+        meta_data["model"]["model_type"] = "updated"
+        mock_blob_storage.set_meta_data("domain-1", "model-1", meta_data)
+        assert mock_blob_storage.get_meta_data("domain-1", "model-1") == meta_data
+        assert mock_blob_storage.get_domain("domain-1") == meta_data
+        mock_read_bytes.assert_called_once()
+
+
+def test_list_models_caches_meta_data(mock_blob_storage):
+    for i in range(2):
+        meta_data = mock_meta_data("domain-1", f"model-{i}", inc_time=i)
+        mock_blob_storage.set_meta_data("domain-1", f"model-{i}", meta_data)
+    for i in range(2):
+        mock_blob_storage._meta_cache.pop(
+            mock_blob_storage._get_metadata_path("domain-1", f"model-{i}")
+        )
+
+    assert mock_blob_storage.list_models("domain-1") == ["model-1", "model-0"]
+    with patch.object(mock_blob_storage, "_read_bytes") as mock_read_bytes:
+        for i in range(2):
+            meta_data = mock_blob_storage.get_meta_data("domain-1", f"model-{i}")
+            assert meta_data["model"]["model_id"] == f"model-{i}"
+        mock_read_bytes.assert_not_called()
+
+
+def test_meta_data_cache_can_be_disabled(monkeypatch, tmp_path):
+    monkeypatch.setenv("MODEL_STORE_META_CACHE_TTL", "0")
+    storage = FileSystemStorage(str(tmp_path))
+    meta_data = mock_meta_data("domain-1", "model-1", inc_time=0)
+    storage.set_meta_data("domain-1", "model-1", meta_data)
+
+    with patch.object(storage, "_read_bytes", wraps=storage._read_bytes) as mock_read:
+        for _ in range(2):
+            assert storage.get_meta_data("domain-1", "model-1") == meta_data
+            assert storage.get_domain("domain-1") == meta_data
+            with pytest.raises(ModelNotFoundException):
+                storage.get_meta_data("domain-1", "model-2")
+        # The meta-data, the domain, and the missing model (and its deleted state)
+        assert mock_read.call_count == 8
+
+
+def test_get_missing_meta_data_is_cached(mock_blob_storage):
+    with patch.object(
+        mock_blob_storage, "_read_bytes", wraps=mock_blob_storage._read_bytes
+    ) as mock_read_bytes:
+        for _ in range(2):
+            with pytest.raises(ModelNotFoundException):
+                mock_blob_storage.get_meta_data("domain-1", "model-1")
+        # The model's meta-data and its deleted state's meta-data
+        assert mock_read_bytes.call_count == 2
+
+    # Setting the meta-data invalidates the cache
+    meta_data = mock_meta_data("domain-1", "model-1", inc_time=0)
+    mock_blob_storage.set_meta_data("domain-1", "model-1", meta_data)
+    assert mock_blob_storage.get_meta_data("domain-1", "model-1") == meta_data
+
+
+def test_exists(mock_blob_storage):
+    assert not mock_blob_storage.exists("domain-1", "model-1")
+
+    # Set the meta data of a fake model
+    meta_data = mock_meta_data("domain-1", "model-1", inc_time=0)
+    mock_blob_storage.set_meta_data("domain-1", "model-1", meta_data)
+    assert mock_blob_storage.exists("domain-1", "model-1")
+    assert not mock_blob_storage.exists("domain-1", "model-2")
+
+
 @pytest.mark.parametrize(
     "domain,model_id",
     [(None, "model-2"), ("", "model-2"), ("domain-1", None), ("domain-1", "")],
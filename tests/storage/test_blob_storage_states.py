@@ -14,6 +14,7 @@
 import os
 import json
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 import pytest
 import modelstore
@@ -43,14 +44,27 @@ def mock_meta_data(domain: str, model_id: str, inc_time: int):
 
 def assert_file_contents_equals(file_path: str, expected: dict):
     with open(file_path, "r") as lines:
-        actual = lines.read()
-    assert json.dumps(expected) == actual
+        actual = json.load(lines)
+    assert expected == actual
 
 
 def test_state_exists(mock_blob_storage):
     assert not mock_blob_storage.state_exists("foo")
 
 
+@pytest.mark.parametrize("state_name", ["production", "deleted"])
+def test_state_exists_does_not_pull(mock_blob_storage, state_name):
+    mock_blob_storage.create_model_state(state_name)
+    with patch.object(mock_blob_storage, "_pull") as mock_pull:
+        assert mock_blob_storage.state_exists(state_name)
+        mock_pull.assert_not_called()
+
+
+@pytest.mark.parametrize("state_name", ["", "ab", "../production"])
+def test_state_exists_invalid_name(mock_blob_storage, state_name):
+    assert not mock_blob_storage.state_exists(state_name)
+
+
 def test_create_model_state(mock_blob_storage):
     # Create a model state
     mock_blob_storage.create_model_state("production")
@@ -109,6 +123,19 @@ def test_set_model_state(mock_blob_storage):
     assert items[0] == "model-1"
 
 
+def test_set_model_state_does_not_use_files(mock_blob_storage):
+    meta_data = mock_meta_data("domain-1", "model-1", inc_time=0)
+    mock_blob_storage.set_meta_data("domain-1", "model-1", meta_data)
+    with patch.object(mock_blob_storage, "_pull") as mock_pull:
+        with patch.object(mock_blob_storage, "_push") as mock_push:
+            mock_blob_storage.create_model_state("production")
+            mock_blob_storage.set_model_state("domain-1", "model-1", "production")
+            mock_pull.assert_not_called()
+            mock_push.assert_not_called()
+    items = mock_blob_storage.list_models("domain-1", "production")
+    assert items == ["model-1"]
+
+
 def test_unset_model_state(mock_blob_storage):
     # Create a models in a domain
     meta_data = mock_meta_data("domain-1", "model-1", inc_time=0)
@@ -15,15 +15,20 @@ import os
 from unittest import mock
 
 import pytest
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
 from google.cloud.storage.blob import Blob
+from modelstore.storage import gcloud
 from modelstore.storage.gcloud import GoogleCloudStorage
+from modelstore.utils.exceptions import FilePullFailedException
 
 # pylint: disable=unused-import
 from tests.storage.test_utils import (
     TEST_FILE_CONTENTS,
+    TEST_FILE_LIST,
     TEST_FILE_NAME,
     remote_file_path,
+    remote_path,
     temp_file,
 )
 
@@ -49,12 +54,13 @@ def gcloud_client(
         mock_bucket = gcloud_bucket()
         mock_bucket.client = mock_client
         mock_client.get_bucket.return_value = mock_bucket
+        mock_client.bucket.return_value = mock_bucket
         mock_buckets.append(mock_bucket)
 
         mock_blob = mock.create_autospec(storage.Blob)
         mock_blob.exists.return_value = files_exist
         if files_exist:
-            mock_blob.download_as_string.return_value = file_contents
+            mock_blob.download_as_bytes.return_value = file_contents
         mock_bucket.blob.return_value = mock_blob
     mock_client.list_buckets.return_value = mock_buckets
     return mock_client
@@ -105,6 +111,33 @@ def test_validate(bucket_exists, validate_should_pass):
     assert storage.validate() == validate_should_pass
 
 
+def test_validate_is_memoized():
+    mock_client = gcloud_client(bucket_exists=True, files_exist=False)
+    storage = gcloud_storage(mock_client)
+    assert storage.validate()
+    assert storage.validate()
+    mock_client.list_buckets.assert_called_once()
+
+
+def test_bucket_is_reused():
+    mock_client = gcloud_client(bucket_exists=True, files_exist=False)
+    storage = gcloud_storage(mock_client)
+    assert storage.bucket is storage.bucket
+    mock_client.bucket.assert_called_once_with(_MOCK_BUCKET_NAME)
+    mock_client.get_bucket.assert_not_called()
+
+
+@mock.patch("modelstore.storage.gcloud.storage.Client", autospec=True)
+def test_client_connection_pool(mock_client_class):
+    storage = GoogleCloudStorage(
+        project_name="project-name", bucket_name=_MOCK_BUCKET_NAME, max_pool=8
+    )
+    client = storage.client
+    client._http.mount.assert_called_once()
+    _, adapter = client._http.mount.call_args[0]
+    assert adapter._pool_maxsize == 8
+
+
 def test_push(tmp_path):
     # Create a client
     mock_client = gcloud_client(bucket_exists=True, files_exist=False)
@@ -124,6 +157,77 @@ def test_push(tmp_path):
     mock_blob.upload_from_file.assert_called()
 
 
+@pytest.fixture
+def mock_transfer_manager(monkeypatch):
+    transfer_manager = mock.MagicMock()
+    monkeypatch.setattr(gcloud, "TRANSFER_MANAGER_EXISTS", True)
+    monkeypatch.setattr(gcloud, "transfer_manager", transfer_manager, raising=False)
+    return transfer_manager
+
+
+def test_push_chunks_concurrently(tmp_path, mock_transfer_manager):
+    mock_client = gcloud_client(bucket_exists=True, files_exist=False)
+    storage = GoogleCloudStorage(
+        project_name="project-name",
+        bucket_name=_MOCK_BUCKET_NAME,
+        client=mock_client,
+        chunk_size=1,
+        max_workers=2,
+    )
+    source = temp_file(tmp_path)
+    assert storage._push(source, remote_file_path()) == remote_file_path()
+
+    mock_blob = storage.bucket.blob(remote_file_path())
+    mock_transfer_manager.upload_chunks_concurrently.assert_called_once_with(
+        source,
+        mock_blob,
+        chunk_size=1,
+        worker_type=mock_transfer_manager.THREAD,
+        max_workers=2,
+    )
+    mock_blob.upload_from_file.assert_not_called()
+
+
+def test_push_without_transfer_manager(monkeypatch, tmp_path):
+    monkeypatch.setattr(gcloud, "TRANSFER_MANAGER_EXISTS", False)
+    mock_client = gcloud_client(bucket_exists=True, files_exist=False)
+    storage = GoogleCloudStorage(
+        project_name="project-name",
+        bucket_name=_MOCK_BUCKET_NAME,
+        client=mock_client,
+        chunk_size=1,
+    )
+    storage._push(temp_file(tmp_path), remote_file_path())
+    storage.bucket.blob(remote_file_path()).upload_from_file.assert_called_once()
+
+
+@pytest.mark.parametrize("file_name,inline", [("file.txt", False), ("file.json", True)])
+def test_push_bytes(file_name, inline):
+    mock_client = gcloud_client(bucket_exists=True, files_exist=False)
+    storage = gcloud_storage(mock_client)
+    prefix = os.path.join(remote_path(), file_name)
+    assert storage._push_bytes(TEST_FILE_CONTENTS.encode(), prefix) == prefix
+
+    mock_blob = storage.bucket.blob(prefix)
+    mock_blob.upload_from_string.assert_called_once_with(TEST_FILE_CONTENTS.encode())
+    if inline:
+        assert mock_blob.metadata == {"m": TEST_FILE_CONTENTS}
+
+
+def test_copy():
+    mock_client = gcloud_client(bucket_exists=True, files_exist=True)
+    storage = gcloud_storage(mock_client)
+    destination = os.path.join(remote_path(), "copied-file.txt")
+    assert storage._copy(remote_file_path(), destination) == destination
+    storage.bucket.copy_blob.assert_called_once_with(
+        storage.bucket.blob(remote_file_path()), storage.bucket, destination
+    )
+
+    storage.bucket.copy_blob.side_effect = NotFound("missing")
+    with pytest.raises(FilePullFailedException):
+        storage._copy(remote_file_path(), destination)
+
+
 def test_pull(tmp_path):
     # Create a client
     mock_client = gcloud_client(bucket_exists=True, files_exist=True)
@@ -143,6 +247,73 @@ def test_pull(tmp_path):
     mock_blob.download_to_filename.assert_called_with(local_destination)
 
 
+def test_pull_chunks_concurrently(tmp_path, mock_transfer_manager):
+    mock_client = gcloud_client(bucket_exists=True, files_exist=True)
+    storage = gcloud_storage(mock_client)
+    result = storage._pull(remote_file_path(), tmp_path)
+    assert result == os.path.join(tmp_path, TEST_FILE_NAME)
+
+    mock_blob = storage.bucket.blob(remote_file_path())
+    mock_transfer_manager.download_chunks_concurrently.assert_called_once_with(
+        mock_blob,
+        result,
+        chunk_size=storage.chunk_size,
+        worker_type=mock_transfer_manager.THREAD,
+        max_workers=storage.max_workers,
+    )
+    mock_blob.download_to_filename.assert_not_called()
+
+
+def test_pull_without_transfer_manager(monkeypatch, tmp_path):
+    monkeypatch.setattr(gcloud, "TRANSFER_MANAGER_EXISTS", False)
+    mock_client = gcloud_client(bucket_exists=True, files_exist=True)
+    storage = gcloud_storage(mock_client)
+    result = storage._pull(remote_file_path(), tmp_path)
+    mock_blob = storage.bucket.blob(remote_file_path())
+    mock_blob.download_to_filename.assert_called_once_with(result)
+
+
+def test_open():
+    mock_client = gcloud_client(bucket_exists=True, files_exist=True)
+    storage = gcloud_storage(mock_client)
+    mock_blob = storage.bucket.blob(remote_file_path())
+    assert storage._open(remote_file_path()) == mock_blob.open.return_value
+    mock_blob.open.assert_called_once_with("rb", chunk_size=storage.chunk_size)
+
+
+def test_open_missing_file():
+    mock_client = gcloud_client(bucket_exists=True, files_exist=False)
+    storage = gcloud_storage(mock_client)
+    mock_blob = storage.bucket.blob(remote_file_path())
+    mock_blob.reload.side_effect = NotFound("missing")
+    with pytest.raises(FilePullFailedException):
+        storage._open(remote_file_path())
+    mock_blob.open.assert_not_called()
+
+
+def test_read_bytes():
+    mock_client = gcloud_client(bucket_exists=True, files_exist=True)
+    storage = gcloud_storage(mock_client)
+    assert storage._read_bytes(remote_file_path()) == TEST_FILE_CONTENTS
+
+    mock_blob = storage.bucket.blob(remote_file_path())
+    mock_blob.download_as_bytes.side_effect = NotFound("missing")
+    with pytest.raises(FilePullFailedException):
+        storage._read_bytes(remote_file_path())
+
+
+@pytest.mark.parametrize("file_exists", [False, True])
+def test_exists(file_exists):
+    mock_client = gcloud_client(bucket_exists=True, files_exist=file_exists)
+    storage = gcloud_storage(mock_client)
+    assert storage._exists(remote_file_path()) == file_exists
+
+    # Asserts that the file was not downloaded
+    mock_blob = mock_client.bucket(storage.bucket_name).blob(remote_file_path())
+    mock_blob.download_as_bytes.assert_not_called()
+    mock_blob.download_to_filename.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "file_exists,should_call_delete",
     [
@@ -179,6 +350,17 @@ def test_remove(file_exists, should_call_delete):
         pytest.fail("Remove raised an exception")
 
 
+def test_list_prefix():
+    mock_client = gcloud_client(bucket_exists=True, files_exist=False)
+    mock_client.list_blobs.return_value = [
+        Blob(name=name, bucket=_MOCK_BUCKET_NAME) for name in TEST_FILE_LIST
+    ]
+    storage = gcloud_storage(mock_client)
+    assert storage._list_prefix(remote_path()) == TEST_FILE_LIST
+    mock_client.list_blobs.assert_called_once()
+    assert mock_client.list_blobs.call_args[1]["prefix"] == remote_path() + "/"
+
+
 def test_read_json_objects_ignores_non_json():
     mock_client = gcloud_client(bucket_exists=True, files_exist=False)
     mock_client.list_blobs.return_value = [
@@ -191,6 +373,55 @@ def test_read_json_objects_ignores_non_json():
     assert len(items) == 0
 
 
+def test_read_json_objects():
+    mock_client = gcloud_client(bucket_exists=True, files_exist=False)
+    mock_blobs = []
+    for name in TEST_FILE_LIST:
+        mock_blob = mock.create_autospec(Blob)
+        mock_blob.name = name
+        mock_blob.metadata = None
+        mock_blob.download_as_bytes.return_value = TEST_FILE_CONTENTS.encode()
+        mock_blobs.append(mock_blob)
+    mock_client.list_blobs.return_value = mock_blobs
+
+    # Argument (remote prefix) is ignored here because of mock above
+    storage = gcloud_storage(mock_client)
+    items = storage._read_json_objects("")
+    assert len(items) == len(TEST_FILE_LIST)
+    for mock_blob in mock_blobs:
+        mock_blob.download_as_bytes.assert_called_once()
+
+
+def test_read_json_objects_from_blob_meta_data():
+    mock_client = gcloud_client(bucket_exists=True, files_exist=False)
+    mock_blobs = []
+    for name in TEST_FILE_LIST:
+        mock_blob = mock.create_autospec(Blob)
+        mock_blob.name = name
+        mock_blob.metadata = {"m": TEST_FILE_CONTENTS}
+        mock_blobs.append(mock_blob)
+    mock_client.list_blobs.return_value = mock_blobs
+
+    # Argument (remote prefix) is ignored here because of mock above
+    storage = gcloud_storage(mock_client)
+    items = storage._read_json_objects("")
+    assert len(items) == len(TEST_FILE_LIST)
+    for mock_blob in mock_blobs:
+        mock_blob.download_as_bytes.assert_not_called()
+
+
+def test_push_json_file_stores_contents_in_meta_data(tmp_path):
+    mock_client = gcloud_client(bucket_exists=True, files_exist=False)
+    storage = gcloud_storage(mock_client)
+
+    prefix = remote_file_path().replace(".txt", ".json")
+    storage._push(temp_file(tmp_path), prefix)
+
+    mock_blob = storage.bucket.blob(prefix)
+    assert mock_blob.metadata == {"m": TEST_FILE_CONTENTS}
+    mock_blob.upload_from_file.assert_called()
+
+
 def test_read_json_object_fails_gracefully():
     prefix = remote_file_path()
     mock_client = gcloud_client(
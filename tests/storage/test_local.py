@@ -11,12 +11,17 @@
 #    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
+import copy
 import json
 import os
+import pickle
 
 import pytest
 from modelstore.storage.local import FileSystemStorage
-from modelstore.utils.exceptions import DomainNotFoundException
+from modelstore.utils.exceptions import (
+    DomainNotFoundException,
+    FilePullFailedException,
+)
 import shutil
 
 # pylint: disable=unused-import
@@ -68,6 +73,41 @@ def test_create_fails_with_missing_environment_variables(monkeypatch):
         _ = FileSystemStorage()
 
 
+@pytest.mark.parametrize("max_workers,expected", [(None, 16), ("4", 4)])
+def test_io_pool_size(monkeypatch, tmp_path, max_workers, expected):
+    if max_workers is not None:
+        monkeypatch.setenv("MODEL_STORE_MAX_WORKERS", max_workers)
+    else:
+        monkeypatch.delenv("MODEL_STORE_MAX_WORKERS", raising=False)
+    storage = FileSystemStorage(str(tmp_path))
+    # The pool is only created when it is first used
+    assert storage._io_pool is None
+    assert storage._get_io_pool()._max_workers == expected
+
+
+def test_close(file_system_storage):
+    assert file_system_storage._map(str, [1, 2, 3]) == ["1", "2", "3"]
+    file_system_storage.close()
+    with pytest.raises(RuntimeError):
+        file_system_storage._map(str, [1, 2, 3])
+
+
+def _pickle_copy(obj):
+    return pickle.loads(pickle.dumps(obj))
+
+
+@pytest.mark.parametrize("copy_func", [copy.deepcopy, _pickle_copy])
+def test_pickle(tmp_path, file_system_storage, copy_func):
+    prefix = file_system_storage._push(temp_file(tmp_path), remote_file_path())
+    assert file_system_storage._map(str, [1, 2]) == ["1", "2"]
+
+    result = copy_func(file_system_storage)
+    assert result.root_prefix == file_system_storage.root_prefix
+    assert result._io_pool is None
+    assert result._map(str, [1, 2]) == ["1", "2"]
+    assert result._read_bytes(prefix) == TEST_FILE_CONTENTS.encode()
+
+
 def test_validate(file_system_storage):
     assert file_system_storage.validate()
     assert os.path.exists(file_system_storage.root_prefix)
@@ -79,6 +119,22 @@ def test_push(tmp_path, file_system_storage):
     assert result == os.path.join(file_system_storage.root_prefix, prefix)
 
 
+def test_push_bytes(file_system_storage):
+    result = file_system_storage._push_bytes(b"contents", remote_file_path())
+    with open(result, "rb") as lines:
+        assert lines.read() == b"contents"
+
+
+def test_copy(file_system_storage):
+    source = file_system_storage._push_bytes(b"contents", remote_file_path())
+    destination = remote_path() + "/copied-file.txt"
+    result = file_system_storage._copy(source, destination)
+    with open(result, "rb") as lines:
+        assert lines.read() == b"contents"
+    with pytest.raises(FilePullFailedException):
+        file_system_storage._copy(remote_path() + "/missing-file.txt", destination)
+
+
 def test_pull(tmp_path, file_system_storage):
     # Push the file to storage
     prefix = remote_file_path()
@@ -92,6 +148,37 @@ def test_pull(tmp_path, file_system_storage):
     assert file_contains_expected_contents(local_destination)
 
 
+def test_open(tmp_path, file_system_storage):
+    # Push the file to storage
+    prefix = remote_file_path()
+    remote_destination = file_system_storage._push(temp_file(tmp_path), prefix)
+
+    # The stored file is read in place
+    with file_system_storage._open(remote_destination) as stream:
+        assert stream.name == remote_destination
+        assert stream.read().decode("utf-8") == TEST_FILE_CONTENTS
+
+
+def test_open_missing_file(file_system_storage):
+    with pytest.raises(FilePullFailedException):
+        file_system_storage._open(remote_file_path())
+
+
+def test_read_bytes(tmp_path, file_system_storage):
+    prefix = file_system_storage._push(temp_file(tmp_path), remote_file_path())
+    assert file_system_storage._read_bytes(prefix) == TEST_FILE_CONTENTS.encode()
+    with pytest.raises(FilePullFailedException):
+        file_system_storage._read_bytes(remote_path() + "/missing-file.txt")
+
+
+@pytest.mark.parametrize("file_exists", [False, True])
+def test_exists(tmp_path, file_system_storage, file_exists):
+    prefix = remote_file_path()
+    if file_exists:
+        file_system_storage._push(temp_file(tmp_path), prefix)
+    assert file_system_storage._exists(prefix) == file_exists
+
+
 @pytest.mark.parametrize(
     "file_exists,should_call_delete",
     [
@@ -120,6 +207,19 @@ def test_remove(file_exists, should_call_delete, tmp_path, file_system_storage):
         pytest.fail("Remove raised an exception")
 
 
+def test_list_prefix(tmp_path, file_system_storage):
+    prefix = remote_path()
+    expected = [
+        file_system_storage._push(temp_file(tmp_path), os.path.join(prefix, x))
+        for x in ["file.txt", "sub-prefix/file.json"]
+    ]
+    file_system_storage._push(temp_file(tmp_path), "other-prefix/file.txt")
+    assert sorted(file_system_storage._list_prefix(prefix)) == expected
+    assert file_system_storage._list_prefix("missing-prefix") == []
+    missing_path = os.path.join(file_system_storage.root_prefix, "missing-prefix")
+    assert not os.path.exists(missing_path)
+
+
 def test_read_json_objects_ignores_non_json(tmp_path, file_system_storage):
     # Create files with different suffixes
     prefix = remote_path()
@@ -137,6 +237,25 @@ def test_read_json_objects_ignores_non_json(tmp_path, file_system_storage):
     assert len(items) == 1
 
 
+def test_read_json_objects_is_cached(tmp_path, file_system_storage):
+    prefix = remote_path()
+    source = os.path.join(tmp_path, "test-file-source.json")
+    with open(source, "w") as out:
+        out.write(json.dumps({"key": "value"}))
+
+    file_system_storage._push(source, os.path.join(prefix, "file-1.json"))
+    assert len(file_system_storage._read_json_objects(prefix)) == 1
+
+    # Files that are added outside of the storage are not listed
+    # until the cache expires
+    shutil.copy(source, file_system_storage.relative_dir(prefix + "/file-2.json"))
+    assert len(file_system_storage._read_json_objects(prefix)) == 1
+
+    # Files that are pushed invalidate the cached listing
+    file_system_storage._push(source, os.path.join(prefix, "file-3.json"))
+    assert len(file_system_storage._read_json_objects(prefix)) == 3
+
+
 def test_read_json_object_fails_gracefully(tmp_path, file_system_storage):
     # Push a file that doesn't contain JSON to storage
     remote_path = file_system_storage._push(
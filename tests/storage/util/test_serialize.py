@@ -0,0 +1,81 @@
+#    Copyright 2022 Neal Lathia
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+import json
+import math
+
+import pytest
+from modelstore.storage.util import serialize
+
+# pylint: disable=protected-access
+
+
+@pytest.mark.parametrize("orjson_exists", [True, False])
+@pytest.mark.parametrize("body", ['{"k": "v"}', b'{"k": "v"}'])
+def test_loads(monkeypatch, orjson_exists, body):
+    if orjson_exists and not serialize.ORJSON_EXISTS:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(serialize, "ORJSON_EXISTS", orjson_exists)
+    assert serialize.loads(body) == {"k": "v"}
+
+
+@pytest.mark.parametrize("orjson_exists", [True, False])
+def test_loads_invalid_json(monkeypatch, orjson_exists):
+    if orjson_exists and not serialize.ORJSON_EXISTS:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(serialize, "ORJSON_EXISTS", orjson_exists)
+    with pytest.raises(json.JSONDecodeError):
+        serialize.loads("not json")
+
+
+@pytest.mark.parametrize("orjson_exists", [True, False])
+def test_loads_non_finite_floats(monkeypatch, orjson_exists):
+    if orjson_exists and not serialize.ORJSON_EXISTS:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(serialize, "ORJSON_EXISTS", orjson_exists)
+    # Meta-data written with json.dumps() may contain NaN and Infinity
+    body = json.dumps({"nan": float("nan"), "inf": float("inf")})
+    result = serialize.loads(body.encode("utf-8"))
+    assert math.isnan(result["nan"])
+    assert result["inf"] == float("inf")
+
+
+@pytest.mark.parametrize("orjson_exists", [True, False])
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {"k": "v"},
+        {"k": {"nested": [1, 2.5, None, True]}},
+        {1: "non-string key"},
+        {"k": 2**70},
+    ],
+)
+def test_dumps(monkeypatch, orjson_exists, obj):
+    if orjson_exists and not serialize.ORJSON_EXISTS:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(serialize, "ORJSON_EXISTS", orjson_exists)
+    result = serialize.dumps(obj)
+    assert isinstance(result, bytes)
+    assert json.loads(result) == json.loads(json.dumps(obj))
+
+
+@pytest.mark.parametrize("orjson_exists", [True, False])
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_dumps_non_finite_floats(monkeypatch, orjson_exists, value):
+    if orjson_exists and not serialize.ORJSON_EXISTS:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(serialize, "ORJSON_EXISTS", orjson_exists)
+    obj = {"model": {"params": {"tol": [value]}, "none": None}}
+    assert serialize.dumps(obj) == json.dumps(obj).encode("utf-8")
+    result = serialize.loads(serialize.dumps(obj))
+    assert str(result["model"]["params"]["tol"][0]) == str(value)
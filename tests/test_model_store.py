@@ -11,7 +11,9 @@
 #    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
+import asyncio
 from functools import partial
+from unittest import mock
 from unittest.mock import patch
 
 import pytest
@@ -19,6 +21,7 @@ from modelstore.model_store import ModelStore
 from modelstore.models.managers import _LIBRARIES
 from modelstore.models.missing_manager import MissingDepManager
 from modelstore.models.model_manager import ModelManager
+from modelstore.storage.gcloud import GoogleCloudStorage
 from modelstore.storage.local import FileSystemStorage
 from modelstore.utils.exceptions import (
     ModelNotFoundException,
@@ -100,3 +103,123 @@ def test_model_not_found(tmp_path):
     store = ModelStore.from_file_system(root_directory=str(tmp_path))
     with pytest.raises(ModelNotFoundException):
         store.get_model_info("missing-domain", "missing-model")
+
+
+def test_get_model_info_is_cached(tmp_path):
+    # The meta-data is cached by the storage, not by the ModelStore
+    store = ModelStore.from_file_system(root_directory=str(tmp_path))
+    meta_data = {"model": {"domain": "domain", "model_id": "model-id"}}
+    store.storage.set_meta_data("domain", "model-id", meta_data)
+    store.storage._meta_cache.pop(
+        store.storage._get_metadata_path("domain", "model-id")
+    )
+
+    with patch.object(
+        store.storage, "_read_bytes", wraps=store.storage._read_bytes
+    ) as mock_read_bytes:
+        assert store.get_model_info("domain", "model-id") == meta_data
+        assert store.get_model_info("domain", "model-id") == meta_data
+        mock_read_bytes.assert_called_once()
+
+        # Callers receive a copy of the cached meta-data
+        store.get_model_info("domain", "model-id")["model"]["domain"] = "changed"
+        assert store.get_model_info("domain", "model-id") == meta_data
+        mock_read_bytes.assert_called_once()
+
+
+def test_check_model_exists(tmp_path):
+    store = ModelStore.from_file_system(root_directory=str(tmp_path))
+    assert not store.check_model_exists("domain", "model-id")
+
+    meta_data = {"model": {"domain": "domain", "model_id": "model-id"}}
+    store.storage.set_meta_data("domain", "model-id", meta_data)
+    assert store.check_model_exists("domain", "model-id")
+
+
+def test_get_models_info_async(tmp_path):
+    store = ModelStore.from_file_system(root_directory=str(tmp_path))
+    model_ids = [f"model-{i}" for i in range(3)]
+    for model_id in model_ids:
+        meta_data = {"model": {"domain": "domain", "model_id": model_id}}
+        store.storage.set_meta_data("domain", model_id, meta_data)
+
+    results = asyncio.run(store.get_models_info_async("domain", model_ids))
+    assert [r["model"]["model_id"] for r in results] == model_ids
+    assert asyncio.run(store.get_model_info_async("domain", "model-1")) == results[1]
+
+
+@patch("modelstore.model_store.iter_libraries", side_effect=iter_only_sklearn)
+def test_load_missing_library(_, tmp_path):
+    store = ModelStore.from_file_system(root_directory=str(tmp_path))
+    meta_data = {
+        "model": {
+            "domain": "domain",
+            "model_id": "model-id",
+            "model_type": {"library": "xgboost"},
+        }
+    }
+    store.storage.set_meta_data("domain", "model-id", meta_data)
+    with pytest.raises(ValueError):
+        store.load("domain", "model-id")
+
+
+@patch("modelstore.model_store.iter_libraries", side_effect=iter_only_sklearn)
+def test_load_multiple_models_missing_library(_, tmp_path):
+    store = ModelStore.from_file_system(root_directory=str(tmp_path))
+    meta_data = {
+        "model": {
+            "domain": "domain",
+            "model_id": "model-id",
+            "model_type": {
+                "library": "multiple-models",
+                "models": [{"library": "sklearn"}, {"library": "xgboost"}],
+            },
+        }
+    }
+    store.storage.set_meta_data("domain", "model-id", meta_data)
+    with pytest.raises(ValueError):
+        store.load("domain", "model-id")
+
+
+@patch("modelstore.models.multiple_models.get_manager")
+@patch("modelstore.model_store.iter_libraries", side_effect=iter_only_sklearn)
+def test_load_multiple_models_uses_store_managers(_, mock_get_manager, tmp_path):
+    store = ModelStore.from_file_system(root_directory=str(tmp_path))
+    meta_data = {
+        "model": {
+            "domain": "domain",
+            "model_id": "model-id",
+            "model_type": {
+                "library": "multiple-models",
+                "models": [{"library": "sklearn"}],
+            },
+        }
+    }
+    store.storage.set_meta_data("domain", "model-id", meta_data)
+    manager = store._libraries_by_name["sklearn"]
+    with patch.object(ModelStore, "download"), patch.object(
+        manager, "load", return_value="model"
+    ):
+        assert store.load("domain", "model-id") == {"sklearn": "model"}
+    mock_get_manager.assert_not_called()
+
+
+@patch("modelstore.model_store._VALIDATED_STORAGE", new_callable=set)
+def test_cloud_storage_is_validated_once(_):
+    storage = mock.create_autospec(GoogleCloudStorage, instance=True)
+    storage.bucket_name = "gcs-bucket-name"
+    storage.validate.return_value = True
+
+    _ = ModelStore(storage=storage)
+    _ = ModelStore(storage=storage)
+    storage.validate.assert_called_once()
+
+
+def test_skip_validation():
+    storage = mock.create_autospec(GoogleCloudStorage, instance=True)
+    storage.validate.return_value = False
+    with pytest.raises(Exception):
+        _ = ModelStore(storage=storage)
+
+    _ = ModelStore(storage=storage, validate=False)
+    storage.validate.assert_called_once()
@@ -0,0 +1,252 @@
+#    Copyright 2022 Neal Lathia
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+import os
+import tarfile
+from unittest.mock import patch
+
+import pytest
+from modelstore.utils import archives
+
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def model_files(tmp_path):
+    source_dir = os.path.join(tmp_path, "source")
+    os.makedirs(source_dir)
+    file_paths = []
+    for i in range(3):
+        file_path = os.path.join(source_dir, f"file-{i}.txt")
+        with open(file_path, "w") as out:
+            out.write(f"contents-{i}" * (i + 1))
+        file_paths.append(file_path)
+    return file_paths
+
+
+def _isal_options():
+    return [False, True] if archives.ISAL_EXISTS else [False]
+
+
+@pytest.mark.parametrize("isal_on_create", _isal_options())
+@pytest.mark.parametrize("isal_on_extract", _isal_options())
+def test_create_and_extract_archive(
+    monkeypatch, tmp_path, model_files, isal_on_create, isal_on_extract
+):
+    archive_path = os.path.join(tmp_path, "artifacts.tar.gz")
+    monkeypatch.setattr(archives, "ISAL_EXISTS", isal_on_create)
+    with archives.create_archive(archive_path) as tar:
+        for file_path in model_files:
+            tar.add(name=file_path, arcname=os.path.split(file_path)[1])
+
+    # The archive can be read with the standard library
+    with tarfile.open(archive_path, "r:gz") as tar:
+        assert len(tar.getnames()) == len(model_files)
+
+    monkeypatch.setattr(archives, "ISAL_EXISTS", isal_on_extract)
+    target_dir = os.path.join(tmp_path, "target")
+    with open(archive_path, "rb") as archive:
+        archives.extract_archive(archive, target_dir)
+
+    for file_path in model_files:
+        target_path = os.path.join(target_dir, os.path.split(file_path)[1])
+        with open(file_path, "r") as source, open(target_path, "r") as target:
+            assert source.read() == target.read()
+
+
+@pytest.mark.skipif(not archives.ISAL_EXISTS, reason="requires isal")
+def test_create_archive_with_best_compression(monkeypatch, tmp_path):
+    monkeypatch.setattr(archives, "ISAL_EXISTS", True)
+    with patch.object(
+        archives.igzip, "IGzipFile", wraps=archives.igzip.IGzipFile
+    ) as mock_gzip_file:
+        with archives.create_archive(os.path.join(tmp_path, "artifacts.tar.gz")):
+            pass
+    _, kwargs = mock_gzip_file.call_args
+    assert kwargs["compresslevel"] == archives.isal_zlib.ISAL_BEST_COMPRESSION
+
+
+@pytest.mark.parametrize("max_pending_bytes", [1, 10, 64 * 1024 * 1024])
+def test_extract_archive_with_directories(
+    monkeypatch, tmp_path, model_files, max_pending_bytes
+):
+    # Files that are larger than max_pending_bytes are extracted in
+    # the main thread, and the rest are written by the thread pool
+    monkeypatch.setattr(archives, "_MAX_PENDING_BYTES", max_pending_bytes)
+    archive_path = os.path.join(tmp_path, "artifacts.tar.gz")
+    with archives.create_archive(archive_path) as tar:
+        tar.add(name=os.path.dirname(model_files[0]), arcname="nested")
+
+    target_dir = os.path.join(tmp_path, "target")
+    with open(archive_path, "rb") as archive:
+        archives.extract_archive(archive, target_dir)
+
+    for file_path in model_files:
+        file_name = os.path.split(file_path)[1]
+        target_path = os.path.join(target_dir, "nested", file_name)
+        with open(file_path, "r") as source, open(target_path, "r") as target:
+            assert source.read() == target.read()
+        assert os.stat(file_path).st_mode == os.stat(target_path).st_mode
+
+
+def test_extract_archive_outside_of_target(tmp_path, model_files):
+    archive_path = os.path.join(tmp_path, "artifacts.tar.gz")
+    with archives.create_archive(archive_path) as tar:
+        tar.add(name=model_files[0], arcname="../file.txt")
+
+    target_dir = os.path.join(tmp_path, "target")
+    with open(archive_path, "rb") as archive:
+        with pytest.raises(tarfile.ExtractError):
+            archives.extract_archive(archive, target_dir)
+    assert not os.path.exists(os.path.join(tmp_path, "file.txt"))
+
+
+def test_extract_archive_with_many_files(tmp_path):
+    # More files than fit into a single batch of writes
+    source_dir = os.path.join(tmp_path, "source")
+    os.makedirs(source_dir)
+    num_files = archives._WRITE_BATCH_SIZE * 2 + 1
+    for i in range(num_files):
+        with open(os.path.join(source_dir, f"file-{i}.txt"), "w") as out:
+            out.write(f"contents-{i}")
+
+    archive_path = os.path.join(tmp_path, "artifacts.tar.gz")
+    with archives.create_archive(archive_path) as tar:
+        tar.add(name=source_dir, arcname="")
+
+    target_dir = os.path.join(tmp_path, "target")
+    with open(archive_path, "rb") as archive:
+        archives.extract_archive(archive, target_dir)
+
+    assert len(os.listdir(target_dir)) == num_files
+    for i in range(num_files):
+        with open(os.path.join(target_dir, f"file-{i}.txt"), "r") as target:
+            assert target.read() == f"contents-{i}"
+
+
+@pytest.mark.skipif(archives._DATA_FILTER is None, reason="requires tarfile filters")
+def test_extract_archive_removes_unsafe_permissions(tmp_path, model_files):
+    os.chmod(model_files[0], 0o777)
+    archive_path = os.path.join(tmp_path, "artifacts.tar.gz")
+    with archives.create_archive(archive_path) as tar:
+        tar.add(name=model_files[0], arcname="file.txt")
+
+    target_dir = os.path.join(tmp_path, "target")
+    with open(archive_path, "rb") as archive:
+        archives.extract_archive(archive, target_dir)
+
+    # Group and other write permissions are removed by the "data" filter
+    target_path = os.path.join(target_dir, "file.txt")
+    assert os.stat(target_path).st_mode & 0o777 == 0o755
+
+
+def _filter_options():
+    return [False, True] if archives._DATA_FILTER is not None else [False]
+
+
+def test_extract_archive_with_hard_links(tmp_path, model_files):
+    os.link(model_files[0], os.path.join(os.path.dirname(model_files[0]), "link.txt"))
+    archive_path = os.path.join(tmp_path, "artifacts.tar.gz")
+    with archives.create_archive(archive_path) as tar:
+        tar.add(name=os.path.dirname(model_files[0]), arcname="nested")
+        assert any(member.islnk() for member in tar.getmembers())
+
+    target_dir = os.path.join(tmp_path, "target")
+    with open(archive_path, "rb") as archive:
+        archives.extract_archive(archive, target_dir)
+
+    with open(model_files[0], "r") as source:
+        contents = source.read()
+    for file_name in [os.path.split(model_files[0])[1], "link.txt"]:
+        with open(os.path.join(target_dir, "nested", file_name), "r") as target:
+            assert target.read() == contents
+
+
+@pytest.mark.parametrize("use_filter", _filter_options())
+def test_extract_archive_with_read_only_directories(
+    monkeypatch, tmp_path, model_files, use_filter
+):
+    if not use_filter:
+        monkeypatch.setattr(archives, "_DATA_FILTER", None)
+        monkeypatch.setattr(archives, "_EXTRACT_KWARGS", {})
+    source_dir = os.path.dirname(model_files[0])
+    os.utime(source_dir, (1000000000, 1000000000))
+    os.chmod(source_dir, 0o555)
+    archive_path = os.path.join(tmp_path, "artifacts.tar.gz")
+    with archives.create_archive(archive_path) as tar:
+        tar.add(name=source_dir, arcname="nested")
+    os.chmod(source_dir, 0o755)
+
+    # The directories have the same attributes as tarfile would give them
+    expected_dir = os.path.join(tmp_path, "expected")
+    with tarfile.open(archive_path, "r:gz") as tar:
+        tar.extractall(expected_dir, **archives._EXTRACT_KWARGS)
+    target_dir = os.path.join(tmp_path, "target")
+    with open(archive_path, "rb") as archive:
+        archives.extract_archive(archive, target_dir)
+
+    expected = os.stat(os.path.join(expected_dir, "nested"))
+    actual = os.stat(os.path.join(target_dir, "nested"))
+    assert actual.st_mode == expected.st_mode
+    assert actual.st_mtime == expected.st_mtime == 1000000000
+    if not use_filter:
+        assert actual.st_mode & 0o777 == 0o555
+    for file_path in model_files:
+        target_path = os.path.join(target_dir, "nested", os.path.split(file_path)[1])
+        with open(file_path, "r") as source, open(target_path, "r") as target:
+            assert source.read() == target.read()
+    for path in [expected_dir, target_dir]:
+        os.chmod(os.path.join(path, "nested"), 0o755)
+
+
+@pytest.mark.parametrize("max_pending_bytes", [1, 64 * 1024 * 1024])
+def test_extract_archive_with_duplicate_names(
+    monkeypatch, tmp_path, model_files, max_pending_bytes
+):
+    # The last member with a given name is the one that is extracted
+    monkeypatch.setattr(archives, "_MAX_PENDING_BYTES", max_pending_bytes)
+    archive_path = os.path.join(tmp_path, "artifacts.tar.gz")
+    with archives.create_archive(archive_path) as tar:
+        for _ in range(archives._WRITE_BATCH_SIZE):
+            for file_path in model_files:
+                tar.add(name=file_path, arcname="file.txt")
+
+    target_dir = os.path.join(tmp_path, "target")
+    with open(archive_path, "rb") as archive:
+        archives.extract_archive(archive, target_dir)
+
+    target_path = os.path.join(target_dir, "file.txt")
+    with open(model_files[-1], "r") as source, open(target_path, "r") as target:
+        assert source.read() == target.read()
+
+
+def test_extract_archive_limits_pending_bytes(monkeypatch, tmp_path, model_files):
+    # Each file is written before the next one is read into memory
+    monkeypatch.setattr(archives, "_MAX_PENDING_BYTES", 30)
+    archive_path = os.path.join(tmp_path, "artifacts.tar.gz")
+    with archives.create_archive(archive_path) as tar:
+        for file_path in model_files:
+            tar.add(name=file_path, arcname=os.path.split(file_path)[1])
+
+    max_pending_bytes = []
+    add = archives._BatchWriter.add
+
+    def mock_add(writer, target, contents, member):
+        max_pending_bytes.append(writer.pending_bytes + len(contents))
+        add(writer, target, contents, member)
+
+    monkeypatch.setattr(archives._BatchWriter, "add", mock_add)
+    with open(archive_path, "rb") as archive:
+        archives.extract_archive(archive, os.path.join(tmp_path, "target"))
+    assert len(max_pending_bytes) == len(model_files)
+    assert max(max_pending_bytes) <= 30
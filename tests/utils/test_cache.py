@@ -0,0 +1,88 @@
+#    Copyright 2022 Neal Lathia
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+import copy
+import pickle
+from unittest.mock import patch
+
+from modelstore.utils.cache import TTLCache
+
+
+def test_get_and_set():
+    cache = TTLCache(max_size=2)
+    assert cache.get("a") is None
+    assert cache.get("a", "default") == "default"
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+@patch("modelstore.utils.cache.time.monotonic")
+def test_entries_expire(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=1)
+
+    mock_monotonic.return_value = 105.0
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    mock_monotonic.return_value = 111.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_pop_and_clear():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.pop("a")
+    cache.pop("missing")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_zero_ttl_is_not_cached():
+    cache = TTLCache(max_size=2, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    cache.set("a", 1, ttl=10)
+    assert cache.get("a") == 1
+
+
+def test_pickle_and_copy():
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    for result in [pickle.loads(pickle.dumps(cache)), copy.deepcopy(cache)]:
+        assert result.max_size == 2
+        assert result.ttl == 10
+        # Entries are not copied, and the copy has its own lock
+        assert len(result) == 0
+        result.set("b", 2)
+        assert result.get("b") == 2
+    assert cache.get("a") == 1